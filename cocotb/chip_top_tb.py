@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import time
 import random
 import logging
 from pathlib import Path
@@ -11,6 +12,8 @@ from cocotb.clock import Clock
 from cocotb.triggers import Timer, Edge, RisingEdge, FallingEdge, ClockCycles
 from cocotb_tools.runner import get_runner
 
+from hachure_defaults import profiled, runner_log
+
 sim = os.getenv("SIM", "icarus")
 pdk_root = os.getenv("PDK_ROOT", Path("~/.ciel").expanduser())
 pdk = os.getenv("PDK", "gf180mcuD")
@@ -56,6 +59,7 @@ async def start_up(dut):
 
 
 @cocotb.test()
+@profiled(period_ns=20)
 async def test_counter(dut):
     """Run the counter test"""
 
@@ -86,6 +90,8 @@ async def test_counter(dut):
 
 def chip_top_runner():
 
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
     proj_path = Path(__file__).resolve().parent
 
     sources = []
@@ -134,6 +140,7 @@ def chip_top_runner():
         build_args = ["--timing", "--trace", "--trace-fst", "--trace-structs"]
 
     runner = get_runner(sim)
+    start = time.monotonic()
     runner.build(
         sources=sources,
         hdl_toplevel=hdl_toplevel,
@@ -144,14 +151,22 @@ def chip_top_runner():
         waves=True,
     )
 
+    build_time = time.monotonic() - start
+
     plusargs = []
 
+    # The test appends its timing to the profile history (profiled)
+    start = time.monotonic()
     runner.test(
         hdl_toplevel=hdl_toplevel,
         test_module="chip_top_tb,",
         plusargs=plusargs,
         waves=True,
+        extra_env={"SIM_BUILD_TIME": f"{build_time:.3f}", "SIM_LAUNCH_TIME": f"{time.time():.3f}"},
     )
+    test_time = time.monotonic() - start
+
+    runner_log.info(f"Build: {build_time:.1f} s, test: {test_time:.1f} s")
 
 
 if __name__ == "__main__":
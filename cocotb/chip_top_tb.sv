@@ -196,9 +196,30 @@ qspi_psram #( .DEPTH(RAMSIZE) ) i_qspi_psram (
   .io3_io   ( mem_sdio[3]   )
 );
 
+// Waveforms are only dumped with +dump, optionally limited to
+// a scope (DUMP_SCOPE) and a window (+dump_start=<ns>, +dump_stop=<ns>)
+`ifndef DUMP_SCOPE
+  `define DUMP_SCOPE chip_top_tb
+`endif
+
+integer dump_start;
+integer dump_stop;
+
+initial begin
+  if ($test$plusargs("dump")) begin
+    $dumpfile("chip_top_tb.fst");
+    $dumpvars(0, `DUMP_SCOPE);
+    if ($value$plusargs("dump_start=%d", dump_start)) begin
+      $dumpoff;
+      #(dump_start) $dumpon;
+    end
+  end
+end
+
 initial begin
-  $dumpfile("chip_top_tb.fst");
-  $dumpvars(0, chip_top_tb);
+  if ($test$plusargs("dump") && $value$plusargs("dump_stop=%d", dump_stop)) begin
+    #(dump_stop) $dumpoff;
+  end
 end
 
 
@@ -0,0 +1,284 @@
+// SPDX-FileCopyrightText: © 2025 Project Template Contributors
+// SPDX-License-Identifier: Apache-2.0
+// -----------------------------------------------------------------------------
+// File  :  frv_stubs.sv
+// Usage :  Empty FazyRV macros for single-core simulation. Define STUB_FRV_<X>
+//          for every core that is not compiled into the simulation model.
+// -----------------------------------------------------------------------------
+
+`ifdef STUB_FRV_1
+module frv_1 (
+  `ifdef USE_POWER_PINS
+  inout  wire         VDD,
+  inout  wire         VSS,
+  `endif
+  input  logic        clk_i,
+  input  logic        rst_in,
+
+  output logic        wb_imem_stb_o,
+  output logic        wb_imem_cyc_o,
+  output logic [31:0] wb_imem_adr_o,
+  input  logic [31:0] wb_imem_dat_i,
+  input  logic        wb_imem_ack_i,
+
+  output logic        wb_dmem_cyc_o,
+  output logic        wb_dmem_stb_o,
+  output logic        wb_dmem_we_o,
+  input  logic        wb_dmem_ack_i,
+  output logic [3:0]  wb_dmem_be_o,
+  input  logic [31:0] wb_dmem_dat_i,
+  output logic [31:0] wb_dmem_adr_o,
+  output logic [31:0] wb_dmem_dat_o
+);
+
+assign wb_imem_stb_o = 1'b0;
+assign wb_imem_cyc_o = 1'b0;
+assign wb_imem_adr_o = '0;
+assign wb_dmem_cyc_o = 1'b0;
+assign wb_dmem_stb_o = 1'b0;
+assign wb_dmem_we_o  = 1'b0;
+assign wb_dmem_be_o  = '0;
+assign wb_dmem_adr_o = '0;
+assign wb_dmem_dat_o = '0;
+
+endmodule
+`endif
+
+`ifdef STUB_FRV_2
+module frv_2 (
+  `ifdef USE_POWER_PINS
+  inout  wire         VDD,
+  inout  wire         VSS,
+  `endif
+  input  logic        clk_i,
+  input  logic        rst_in,
+
+  output logic        wb_imem_stb_o,
+  output logic        wb_imem_cyc_o,
+  output logic [31:0] wb_imem_adr_o,
+  input  logic [31:0] wb_imem_dat_i,
+  input  logic        wb_imem_ack_i,
+
+  output logic        wb_dmem_cyc_o,
+  output logic        wb_dmem_stb_o,
+  output logic        wb_dmem_we_o,
+  input  logic        wb_dmem_ack_i,
+  output logic [3:0]  wb_dmem_be_o,
+  input  logic [31:0] wb_dmem_dat_i,
+  output logic [31:0] wb_dmem_adr_o,
+  output logic [31:0] wb_dmem_dat_o
+);
+
+assign wb_imem_stb_o = 1'b0;
+assign wb_imem_cyc_o = 1'b0;
+assign wb_imem_adr_o = '0;
+assign wb_dmem_cyc_o = 1'b0;
+assign wb_dmem_stb_o = 1'b0;
+assign wb_dmem_we_o  = 1'b0;
+assign wb_dmem_be_o  = '0;
+assign wb_dmem_adr_o = '0;
+assign wb_dmem_dat_o = '0;
+
+endmodule
+`endif
+
+`ifdef STUB_FRV_4
+module frv_4 (
+  `ifdef USE_POWER_PINS
+  inout  wire         VDD,
+  inout  wire         VSS,
+  `endif
+  input  logic        clk_i,
+  input  logic        rst_in,
+
+  output logic        wb_imem_stb_o,
+  output logic        wb_imem_cyc_o,
+  output logic [31:0] wb_imem_adr_o,
+  input  logic [31:0] wb_imem_dat_i,
+  input  logic        wb_imem_ack_i,
+
+  output logic        wb_dmem_cyc_o,
+  output logic        wb_dmem_stb_o,
+  output logic        wb_dmem_we_o,
+  input  logic        wb_dmem_ack_i,
+  output logic [3:0]  wb_dmem_be_o,
+  input  logic [31:0] wb_dmem_dat_i,
+  output logic [31:0] wb_dmem_adr_o,
+  output logic [31:0] wb_dmem_dat_o
+);
+
+assign wb_imem_stb_o = 1'b0;
+assign wb_imem_cyc_o = 1'b0;
+assign wb_imem_adr_o = '0;
+assign wb_dmem_cyc_o = 1'b0;
+assign wb_dmem_stb_o = 1'b0;
+assign wb_dmem_we_o  = 1'b0;
+assign wb_dmem_be_o  = '0;
+assign wb_dmem_adr_o = '0;
+assign wb_dmem_dat_o = '0;
+
+endmodule
+`endif
+
+`ifdef STUB_FRV_8
+module frv_8 (
+  `ifdef USE_POWER_PINS
+  inout  wire         VDD,
+  inout  wire         VSS,
+  `endif
+  input  logic        clk_i,
+  input  logic        rst_in,
+
+  output logic        wb_imem_stb_o,
+  output logic        wb_imem_cyc_o,
+  output logic [31:0] wb_imem_adr_o,
+  input  logic [31:0] wb_imem_dat_i,
+  input  logic        wb_imem_ack_i,
+
+  output logic        wb_dmem_cyc_o,
+  output logic        wb_dmem_stb_o,
+  output logic        wb_dmem_we_o,
+  input  logic        wb_dmem_ack_i,
+  output logic [3:0]  wb_dmem_be_o,
+  input  logic [31:0] wb_dmem_dat_i,
+  output logic [31:0] wb_dmem_adr_o,
+  output logic [31:0] wb_dmem_dat_o
+);
+
+assign wb_imem_stb_o = 1'b0;
+assign wb_imem_cyc_o = 1'b0;
+assign wb_imem_adr_o = '0;
+assign wb_dmem_cyc_o = 1'b0;
+assign wb_dmem_stb_o = 1'b0;
+assign wb_dmem_we_o  = 1'b0;
+assign wb_dmem_be_o  = '0;
+assign wb_dmem_adr_o = '0;
+assign wb_dmem_dat_o = '0;
+
+endmodule
+`endif
+
+`ifdef STUB_FRV_4CCX
+module frv_4ccx (
+  `ifdef USE_POWER_PINS
+  inout  wire         VDD,
+  inout  wire         VSS,
+  `endif
+  input  logic        clk_i,
+  input  logic        rst_in,
+
+  output logic        wb_imem_stb_o,
+  output logic        wb_imem_cyc_o,
+  output logic [31:0] wb_imem_adr_o,
+  input  logic [31:0] wb_imem_dat_i,
+  input  logic        wb_imem_ack_i,
+
+  output logic        wb_dmem_cyc_o,
+  output logic        wb_dmem_stb_o,
+  output logic        wb_dmem_we_o,
+  input  logic        wb_dmem_ack_i,
+  output logic [3:0]  wb_dmem_be_o,
+  input  logic [31:0] wb_dmem_dat_i,
+  output logic [31:0] wb_dmem_adr_o,
+  output logic [31:0] wb_dmem_dat_o,
+
+  output logic [3:0]  ccx_rs_a_o,
+  output logic [3:0]  ccx_rs_b_o,
+  input  logic [3:0]  ccx_res_i,
+  output logic [1:0]  ccx_sel_o,
+  output logic        ccx_req_o,
+  input  logic        ccx_resp_i
+);
+
+assign wb_imem_stb_o = 1'b0;
+assign wb_imem_cyc_o = 1'b0;
+assign wb_imem_adr_o = '0;
+assign wb_dmem_cyc_o = 1'b0;
+assign wb_dmem_stb_o = 1'b0;
+assign wb_dmem_we_o  = 1'b0;
+assign wb_dmem_be_o  = '0;
+assign wb_dmem_adr_o = '0;
+assign wb_dmem_dat_o = '0;
+assign ccx_rs_a_o    = '0;
+assign ccx_rs_b_o    = '0;
+assign ccx_sel_o     = '0;
+assign ccx_req_o     = 1'b0;
+
+endmodule
+`endif
+
+`ifdef STUB_FRV_1BRAM
+module frv_1bram (
+  `ifdef USE_POWER_PINS
+  inout  wire         VDD,
+  inout  wire         VSS,
+  `endif
+  input  logic        clk_i,
+  input  logic        rst_in,
+
+  output logic        wb_imem_stb_o,
+  output logic        wb_imem_cyc_o,
+  output logic [31:0] wb_imem_adr_o,
+  input  logic [31:0] wb_imem_dat_i,
+  input  logic        wb_imem_ack_i,
+
+  output logic        wb_dmem_cyc_o,
+  output logic        wb_dmem_stb_o,
+  output logic        wb_dmem_we_o,
+  input  logic        wb_dmem_ack_i,
+  output logic [3:0]  wb_dmem_be_o,
+  input  logic [31:0] wb_dmem_dat_i,
+  output logic [31:0] wb_dmem_adr_o,
+  output logic [31:0] wb_dmem_dat_o
+);
+
+assign wb_imem_stb_o = 1'b0;
+assign wb_imem_cyc_o = 1'b0;
+assign wb_imem_adr_o = '0;
+assign wb_dmem_cyc_o = 1'b0;
+assign wb_dmem_stb_o = 1'b0;
+assign wb_dmem_we_o  = 1'b0;
+assign wb_dmem_be_o  = '0;
+assign wb_dmem_adr_o = '0;
+assign wb_dmem_dat_o = '0;
+
+endmodule
+`endif
+
+`ifdef STUB_FRV_8BRAM
+module frv_8bram (
+  `ifdef USE_POWER_PINS
+  inout  wire         VDD,
+  inout  wire         VSS,
+  `endif
+  input  logic        clk_i,
+  input  logic        rst_in,
+
+  output logic        wb_imem_stb_o,
+  output logic        wb_imem_cyc_o,
+  output logic [31:0] wb_imem_adr_o,
+  input  logic [31:0] wb_imem_dat_i,
+  input  logic        wb_imem_ack_i,
+
+  output logic        wb_dmem_cyc_o,
+  output logic        wb_dmem_stb_o,
+  output logic        wb_dmem_we_o,
+  input  logic        wb_dmem_ack_i,
+  output logic [3:0]  wb_dmem_be_o,
+  input  logic [31:0] wb_dmem_dat_i,
+  output logic [31:0] wb_dmem_adr_o,
+  output logic [31:0] wb_dmem_dat_o
+);
+
+assign wb_imem_stb_o = 1'b0;
+assign wb_imem_cyc_o = 1'b0;
+assign wb_imem_adr_o = '0;
+assign wb_dmem_cyc_o = 1'b0;
+assign wb_dmem_stb_o = 1'b0;
+assign wb_dmem_we_o  = 1'b0;
+assign wb_dmem_be_o  = '0;
+assign wb_dmem_adr_o = '0;
+assign wb_dmem_dat_o = '0;
+
+endmodule
+`endif
@@ -2,13 +2,21 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import random
+import re
+import ast
+import csv
+import time
+import fcntl
+import hashlib
 import logging
+import xml.etree.ElementTree as ET
+import functools
 from pathlib import Path
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer, Edge, RisingEdge, FallingEdge, ClockCycles
+from cocotb.triggers import Timer, Edge, Event, with_timeout, SimTimeoutError
+from cocotb.utils import get_sim_time
 from cocotb_tools.runner import get_runner
 
 sim = os.getenv("SIM", "icarus")
@@ -20,8 +28,82 @@ gl = os.getenv("GL", False)
 FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
 hdl_toplevel = "chip_top_tb" if FULL_CHIP is True else "hachure_tb"
 
+# Default clock of start_clock
+CLK_PERIOD_NS = 10
+
+# Must match SIM_DONE_FLAG in firmware/soc.h
+SIM_DONE_FLAG = 0x8
+
+COCOTB_DIR = Path(__file__).resolve().parent
+
+# One simulator process runs several test modules (session.py): every
+# test resets the SoC and the memory models and loads its own firmware
+SIM_SESSION = os.getenv("SIM_SESSION", "0") == "1"
+
+# Build one model per core with all other cores stubbed (frv_stubs.sv)
+SIM_SINGLE_CORE = os.getenv("SIM_SINGLE_CORE", "0") == "1"
+
+# Simulation models are shared between test modules and invocations
+SIM_CACHE = os.getenv("SIM_CACHE", "1") == "1"
+SIM_CACHE_DIR = Path(os.getenv("SIM_CACHE_DIR", Path(__file__).resolve().parent / "sim_build_cache"))
+
+# Additional Verilog defines, e.g. SIM_DEFINES=WB_QSPI_MEM_NO_CRM,FOO=1
+SIM_DEFINES = os.getenv("SIM_DEFINES", "")
+
+# Waveforms: 0 (off), 1 (always) or fail (rerun failing tests with dumping)
+SIM_WAVES = os.getenv("SIM_WAVES", "0")
+SIM_WAVES_SCOPE = os.getenv("SIM_WAVES_SCOPE")
+SIM_WAVES_START = os.getenv("SIM_WAVES_START")
+SIM_WAVES_STOP = os.getenv("SIM_WAVES_STOP")
+
+# Firmware build profile (see firmware/common.mk), O0 uses the plain build directory
+FW_PROFILE = os.getenv("FW_PROFILE", "O0")
+
+# Timing of every test run is appended to this CSV history
+SIM_PROFILE_FILE = Path(os.getenv("SIM_PROFILE_FILE", Path(__file__).resolve().parent / "sim_build_profile.csv"))
+PROFILE_FIELDS = ["date", "test", "core", "sim", "gl", "full_chip", "fw_profile", "result",
+                  "build_s", "elab_s", "wall_s", "sim_ns", "cycles", "cycles_per_s"]
+
+# Wishbone monitors: 1 (all hosts) or a comma separated list of
+# interconnect host/device ports, summaries are appended to the CSV
+SIM_WB_MONITOR = os.getenv("SIM_WB_MONITOR", "")
+SIM_WB_MONITOR_FILE = Path(os.getenv("SIM_WB_MONITOR_FILE", Path(__file__).resolve().parent / "sim_build_wb_monitor.csv"))
+WB_MONITOR_FIELDS = ["date", "test", "core", "port", "device", "transactions", "reads", "writes",
+                     "bytes", "wait_states", "mean_latency", "max_latency", "histogram"]
+
+# Cycles per kernel, code region and data placement of test_bench_mem, see sim_profile.py --bench
+SIM_BENCH_FILE = Path(os.getenv("SIM_BENCH_FILE", Path(__file__).resolve().parent / "sim_build_bench_mem.csv"))
+BENCH_FIELDS = ["date", "core", "sim", "gl", "defines", "code", "data", "kernel", "cycles"]
+
+# CPI per core and code region of test_cpi, see sim_profile.py --cpi
+SIM_CPI_FILE = Path(os.getenv("SIM_CPI_FILE", Path(__file__).resolve().parent / "sim_build_cpi.csv"))
+CPI_FIELDS = ["date", "core", "sim", "gl", "region", "instructions", "cycles", "cpi", "runtime_us"]
+
+# In the simulator this module is imported once elaboration is done
+_import_time = time.time()
+
+# Messages of sim_setup and sim_run, the tests log to cocotb.log
+runner_log = logging.getLogger("cocotb_tools.runner")
+
+CORES = ["1", "2", "4", "8", "4ccx", "1bram", "8bram"]
+
+def module_cores(test_file):
+    """Cores a test module is parametrized over (select_cores(...) argument)"""
+    tree = ast.parse(Path(test_file).read_text())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "select_cores":
+            return ast.literal_eval(node.args[0]) if node.args else list(CORES)
+    return list(CORES)
+
+def select_cores(cores=CORES):
+    """Restrict the parametrized cores, e.g. SIM_CORES=1,4ccx"""
+    selected = os.getenv("SIM_CORES")
+    if not selected:
+        return list(cores)
+    return [core for core in cores if core in selected.split(",")]
+
 async def set_defaults(dut, core):
-    assert core in ["1", "2", "4", "8", "4ccx", "1bram", "8bram"]
+    assert core in CORES
     dut.en_p.value = 1
     dut.en_p2.value = 1
     dut.en_wb.value = 1
@@ -73,19 +155,475 @@ async def reset(reset, active_low=True, time_ns=1000):
     cocotb.log.info("Reset deasserted.")
 
 
-async def start_up(dut, core, from_reset=False):
+async def start_up(dut, core, from_reset=False, firmware=None):
     """Startup sequence"""
+    # Also a module with several firmware images switches between them
+    swap = SIM_SESSION or (firmware is not None and not firmware_loaded(firmware))
+    if swap:
+        # Hold the SoC in reset while switching cores and firmware
+        dut.rst_n.value = 0
     await set_defaults(dut, core)
     if gl:
         await enable_power(dut)
     await start_clock(dut.clk)
-    if from_reset:
+    if swap:
+        backdoor = Backdoor(dut)
+        backdoor.reset_models()
+        if firmware:
+            await load_firmware(backdoor, firmware)
+    if from_reset or swap:
         await reset(dut.rst_n)
 
 
+def read_image(path):
+    """Memory image as [(byte address, data)] from a raw .bin or makehex .hex file"""
+    path = Path(path)
+    if path.suffix == ".bin":
+        # Firmware images are small, reading is as fast as mapping them
+        data = path.read_bytes()
+        return [(0, data)] if data else []
+
+    segments = []
+    address, data = 0, bytearray()
+    for line in path.read_text().split("\n"):
+        line = line.split("//")[0].strip()
+        if not line:
+            continue
+        if line.startswith("@"):
+            if data:
+                segments.append((address, bytes(data)))
+            address, data = int(line[1:], 16), bytearray()
+        else:
+            # Undefined bytes of memory dumps read as zero
+            data += bytes(int(byte, 16) if "x" not in byte.lower() else 0 for byte in line.split())
+    if data:
+        segments.append((address, bytes(data)))
+    return segments
+
+
+def write_image(path, segments):
+    """Write [(byte address, data)] as a sparse hex file for $readmemh"""
+    with open(path, "w") as f:
+        for address, data in segments:
+            f.write(f"@{address:08x}\n")
+            # Any bytes-like data, iterated as ints
+            f.write("\n".join(f"{byte:02x}" for byte in bytes(data)))
+            f.write("\n")
+
+
+class Backdoor:
+    """Bulk access to the flash, PSRAM and on-chip RAM models, bypassing the bus"""
+
+    RAM_BANK_WORDS = 512
+
+    def __init__(self, dut):
+        self.dut = dut
+        self._soc = None
+
+    @property
+    def soc(self):
+        """SoC hierarchy, only present in the RTL (the GL netlist is flattened)"""
+        if gl:
+            raise RuntimeError("The SoC hierarchy is not available in gate-level simulation")
+        if self._soc is None:
+            self._soc = self.dut.i_chip_top.i_chip_core.i_hachure_soc if FULL_CHIP else self.dut.i_hachure_soc
+        return self._soc
+
+    async def _load(self, model, segments):
+        """Load segments into a testbench memory model via $readmemh"""
+        name = f"backdoor_{model._name}.hex"
+        write_image(name, segments)
+        model.backdoor_file.value = int.from_bytes(name.encode(), "big")
+        model.backdoor_load.value = not int(model.backdoor_load.value)
+        await Timer(1, "step")
+
+    async def _dump(self, model, address, length):
+        """Read length bytes of a testbench memory model via $writememh"""
+        name = f"backdoor_{model._name}.hex"
+        model.backdoor_file.value = int.from_bytes(name.encode(), "big")
+        model.backdoor_start.value = address
+        model.backdoor_end.value = address + length - 1
+        model.backdoor_dump.value = not int(model.backdoor_dump.value)
+        await Timer(1, "step")
+        return b"".join(data for _, data in read_image(name))[:length]
+
+    def flashes(self):
+        """Flash models holding the firmware, i_spiflash_2 backs the XIP cache"""
+        return [self.dut.i_spiflash] + ([self.dut.i_spiflash_2] if FULL_CHIP else [])
+
+    def reset_models(self):
+        """Bring the flash and PSRAM models back to their power-up state"""
+        for flash in self.flashes():
+            flash.xip_cmd.value = 0
+            flash.mode.value = 4
+        self.dut.i_qspi_psram.qspi_unlocked_r.value = 0
+
+    async def flash_write(self, address, data, flash=None):
+        await self._load(flash or self.dut.i_spiflash, [(address, data)])
+
+    async def flash_read(self, address, length, flash=None):
+        return await self._dump(flash or self.dut.i_spiflash, address, length)
+
+    async def flash_load(self, image, flash=None):
+        """Load a firmware image (.hex or .bin) into the flash"""
+        await self._load(flash or self.dut.i_spiflash, read_image(image))
+
+    async def psram_write(self, address, data):
+        await self._load(self.dut.i_qspi_psram, [(address & 0xFFFFFF, data)])
+
+    async def psram_read(self, address, length):
+        return await self._dump(self.dut.i_qspi_psram, address & 0xFFFFFF, length)
+
+    def _ram_lane(self, bank, lane):
+        """Byte lane of a RAM bank, with the backdoor of ram512x8 (RAM_BACKDOOR)"""
+        return self.soc.i_wb_ram.gen_ram_bank[bank].i_ram512x32.gen_ram8[lane].u_ram
+
+    def _ram_chunks(self, address, length):
+        """(bank, lane, word index, positions in the data) of the lane images covering a RAM range"""
+        address &= 0xFFFFFFF
+        for lane in range(4):
+            first = (lane - address) % 4
+            positions = range(first, length, 4)
+            word = (address + first) // 4
+            while positions:
+                bank, index = divmod(word, self.RAM_BANK_WORDS)
+                n = min(len(positions), self.RAM_BANK_WORDS - index)
+                yield bank, lane, index, positions[:n]
+                positions, word = positions[n:], word + n
+
+    async def ram_write(self, address, data):
+        """Write bytes at a byte offset into the on-chip RAM (RTL only), one $readmemh per lane"""
+        for bank, lane, index, positions in self._ram_chunks(address, len(data)):
+            await self._load(self._ram_lane(bank, lane), [(index, data[positions.start:positions.stop:4])])
+
+    async def ram_read(self, address, length):
+        """Read bytes at a byte offset into the on-chip RAM, undefined bytes read as zero"""
+        data = bytearray(length)
+        for bank, lane, index, positions in self._ram_chunks(address, length):
+            data[positions.start:positions.stop:4] = await self._dump(self._ram_lane(bank, lane), index, len(positions))
+        return bytes(data)
+
+
+# Firmware currently in the flash models, initially the +firmware plusarg
+_firmware = None
+_firmware_segments = None
+
+
+def firmware_path(firmware):
+    """Image of the FW_PROFILE build, e.g. build/Os/firmware.hex for build/firmware.hex"""
+    firmware = Path(firmware)
+    if FW_PROFILE == "O0":
+        return firmware
+    return firmware.parent / FW_PROFILE / firmware.name
+
+
+def firmware_loaded(firmware):
+    """Whether the firmware is the one in the flash models"""
+    global _firmware, _firmware_segments
+    firmware = (COCOTB_DIR / firmware_path(firmware)).resolve()
+    if _firmware_segments is None:
+        _firmware = Path(os.getenv("SIM_FIRMWARE", firmware)).resolve()
+        _firmware_segments = read_image(_firmware) if _firmware.exists() else []
+    return firmware == _firmware
+
+
+async def load_firmware(backdoor, firmware):
+    """Swap the firmware in the flash models unless it is already loaded"""
+    global _firmware, _firmware_segments
+    if firmware_loaded(firmware):
+        return
+    firmware = (COCOTB_DIR / firmware_path(firmware)).resolve()
+
+    # Zero the previous image first, the new one may not cover it
+    segments = read_image(firmware)
+    stale = [(address, bytes(len(data))) for address, data in _firmware_segments]
+    for flash in backdoor.flashes():
+        await backdoor._load(flash, stale + segments)
+    _firmware, _firmware_segments = firmware, segments
+    cocotb.log.info(f"Loaded firmware {firmware}")
+
+
+def gpo_signal(dut):
+    """GPO as seen by the testbench"""
+    return dut.gpio if FULL_CHIP else dut.gpo
+
+
+class SignalMonitor:
+    """Count and timestamp changes of the masked bits of a signal, woken only by its edges"""
+
+    def __init__(self, signal, mask=None, unresolved="0"):
+        self.signal = signal
+        self.mask = (1 << len(signal)) - 1 if mask is None else mask
+        # X/Z bits read as `unresolved`
+        self._resolve = str.maketrans("xXzZuUwW-", unresolved * 9)
+        self.value = self.sample()
+        self.transitions = 0
+        self.timestamps = []
+        self._changed = Event()
+        self._task = None
+
+    def sample(self):
+        """Current masked value of the signal"""
+        value = self.signal.value
+        try:
+            return int(value) & self.mask
+        except ValueError:
+            return int(str(value).translate(self._resolve), 2) & self.mask
+
+    async def _monitor(self):
+        while True:
+            await Edge(self.signal)
+            value = self.sample()
+            if value != self.value:
+                self.value = value
+                self.transitions += 1
+                self.timestamps.append(get_sim_time("ns"))
+                self._changed.set()
+
+    def start(self):
+        self._task = cocotb.start_soon(self._monitor())
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def wait_transitions(self, count):
+        """Wait until at least count transitions were seen"""
+        while self.transitions < count:
+            self._changed.clear()
+            await self._changed.wait()
+
+
+async def wait_done(dut, timeout_cycles):
+    """Wait until the firmware signals SIM_DONE and return its code"""
+    gpo = gpo_signal(dut)
+
+    def done():
+        value = gpo.value
+        return value.is_resolvable and bool(int(value) & SIM_DONE_FLAG)
+
+    async def handshake():
+        # The flag of a previous test stays set until the firmware restarts
+        while done():
+            await Edge(gpo)
+        while not done():
+            await Edge(gpo)
+        return int(gpo.value) & (SIM_DONE_FLAG - 1)
+
+    try:
+        code = await with_timeout(handshake(), timeout_cycles * CLK_PERIOD_NS, "ns")
+    except SimTimeoutError:
+        raise AssertionError(f"Firmware did not finish within {timeout_cycles} cycles")
+
+    cocotb.log.info(f"Firmware done with code {code}")
+    return code
+
+
+def append_csv(path, fields, rows):
+    """Append rows to a CSV history, with a header if it is new"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        with open(path, "a+", newline="") as f:
+            # Parallel regression jobs share the file
+            fcntl.flock(f, fcntl.LOCK_EX)
+            if not same_file(f, path):
+                # Rotated by another job while waiting for the lock
+                continue
+            f.seek(0)
+            header = f.readline().strip()
+            if header and header != ",".join(fields):
+                # Fields changed, keep the old history aside
+                with open(path.with_suffix(".csv.lock"), "a") as lock:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                    if same_file(f, path):
+                        path.rename(rotated_name(path))
+                continue
+            writer = csv.DictWriter(f, fieldnames=fields)
+            if not header:
+                writer.writeheader()
+            writer.writerows(rows)
+            return
+
+
+def rotated_name(path):
+    """First free <name>.old<n>.csv, so older histories are never overwritten"""
+    n = 1
+    while path.with_suffix(f".old{n}.csv").exists():
+        n += 1
+    return path.with_suffix(f".old{n}.csv")
+
+
+def same_file(f, path):
+    """Whether the open file f is still the one at path"""
+    try:
+        return os.fstat(f.fileno()).st_ino == path.stat().st_ino
+    except FileNotFoundError:
+        return False
+
+
+def record_profile(row):
+    """Append one row to the profile history"""
+    append_csv(SIM_PROFILE_FILE, PROFILE_FIELDS, [row])
+
+
+def start_wb_monitors(dut):
+    """Attach Wishbone monitors to the interconnect ports selected by SIM_WB_MONITOR"""
+    # pyyaml is only needed when monitoring
+    from wb_monitor import WishboneMonitor, load_intercon
+
+    if gl:
+        cocotb.log.warning("SIM_WB_MONITOR needs the RTL hierarchy, no monitors in gate-level simulation")
+        return []
+
+    hosts, devices = load_intercon()
+    ports = hosts if SIM_WB_MONITOR == "1" else SIM_WB_MONITOR.split(",")
+    soc = Backdoor(dut).soc
+    monitors = []
+    for port in ports:
+        try:
+            if port in hosts:
+                monitor = WishboneMonitor.host(soc.i_wb_intercon, port, dut.clk, devices, period_ns=CLK_PERIOD_NS)
+            else:
+                monitor = WishboneMonitor.device(soc.i_wb_intercon, port, dut.clk, period_ns=CLK_PERIOD_NS)
+        except AttributeError:
+            cocotb.log.warning(f"Wishbone port {port} not found, not monitored")
+            continue
+        monitors.append(monitor.start())
+    return monitors
+
+
+def report_wb_monitors(monitors, test, core):
+    """Stop the monitors, log their summary and append it to the CSV"""
+    date = time.strftime("%Y-%m-%dT%H:%M:%S")
+    rows = []
+    for monitor in monitors:
+        monitor.stop()
+        rows += [{"date": date, "test": test, "core": core, **row} for row in monitor.rows()]
+    for row in rows:
+        cocotb.log.info(f"[WB] {row['port']:>12} -> {row['device']:<12} {row['transactions']:>7} transactions "
+                        f"{row['bytes']:>8} bytes, {row['wait_states']:>8} wait states, "
+                        f"latency mean {row['mean_latency']} max {row['max_latency']}")
+    append_csv(SIM_WB_MONITOR_FILE, WB_MONITOR_FIELDS, rows)
+
+
+def profiled(test=None, *, period_ns=CLK_PERIOD_NS):
+    """Record wall time, simulated time and cycles/s of a test, and the bus statistics if enabled"""
+    if test is None:
+        # Used as @profiled(period_ns=...) for another clock
+        return functools.partial(profiled, period_ns=period_ns)
+
+    @functools.wraps(test)
+    async def wrapper(dut, **kwargs):
+        launch = float(os.getenv("SIM_LAUNCH_TIME", _import_time))
+        start_ns = get_sim_time("ns")
+        monitors = start_wb_monitors(dut) if SIM_WB_MONITOR else []
+        start = time.monotonic()
+        result = "fail"
+        try:
+            await test(dut, **kwargs)
+            result = "pass"
+        finally:
+            wall = time.monotonic() - start
+            sim_ns = get_sim_time("ns") - start_ns
+            cycles = int(sim_ns // period_ns)
+            record_profile({
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "test": test.__name__,
+                "core": kwargs.get("core", ""),
+                "sim": sim,
+                "gl": int(bool(gl)),
+                "full_chip": int(FULL_CHIP),
+                "fw_profile": FW_PROFILE,
+                "result": result,
+                "build_s": os.getenv("SIM_BUILD_TIME", ""),
+                "elab_s": f"{_import_time - launch:.3f}",
+                "wall_s": f"{wall:.3f}",
+                "sim_ns": f"{sim_ns:.0f}",
+                "cycles": cycles,
+                "cycles_per_s": f"{cycles / wall:.1f}" if wall > 0 else "",
+            })
+            if monitors:
+                report_wb_monitors(monitors, test.__name__, kwargs.get("core", ""))
+            cocotb.log.info(f"{test.__name__} simulated {cycles} cycles in {wall:.1f} s ({cycles / max(wall, 1e-9):.0f} cycles/s)")
+
+    return wrapper
+
+
+def build_key(sources, defines, includes, build_args, waves):
+    """Content hash over everything that goes into the simulation model"""
+    h = hashlib.sha256()
+    h.update(f"{sim}|{hdl_toplevel}|{waves}|".encode())
+    for source in sources:
+        h.update(Path(source).name.encode())
+        h.update(Path(source).read_bytes())
+    for name, value in sorted(defines.items()):
+        h.update(f"+define+{name}={value}".encode())
+    for include in includes:
+        # Headers in include dirs are not part of the source list
+        for header in sorted(Path(include).glob("*.*vh")):
+            h.update(header.name.encode())
+            h.update(header.read_bytes())
+    for arg in build_args:
+        h.update(f"|{arg}".encode())
+    return h.hexdigest()[:16]
+
+
+def failed_tests(results_xml):
+    """Full names of the failed tests in a results file"""
+    failed = []
+    for case in ET.parse(results_xml).getroot().iter("testcase"):
+        if case.find("failure") is not None or case.find("error") is not None:
+            failed.append(f"{case.get('classname')}.{case.get('name')}")
+    return failed
+
+
+def merge_results(results, results_xml):
+    """Combine the results files of several runs into one"""
+    root = ET.Element("testsuites", name="results")
+    for result in results:
+        if Path(result).exists():
+            root.extend(ET.parse(result).getroot().findall("testsuite"))
+    ET.ElementTree(root).write(results_xml, encoding="utf-8", xml_declaration=True)
+
+
+def cached_build(runner, build_dir, **kwargs):
+    """Build into build_dir unless a complete model is already there"""
+    build_dir = Path(build_dir)
+    build_dir.mkdir(parents=True, exist_ok=True)
+    stamp = build_dir / ".complete"
+
+    # Concurrent test modules wait for the first one to finish the build
+    with open(build_dir / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if stamp.exists():
+            runner_log.info(f"Reusing simulation model in {build_dir}")
+        runner.build(build_dir=build_dir, always=not stamp.exists(), **kwargs)
+        stamp.touch()
+
 
 def sim_setup(test_module, firmware):
 
+    if not SIM_SINGLE_CORE:
+        sim_run(test_module, firmware)
+        return
+
+    test_dir = os.getenv("SIM_TEST_DIR", 'sim_build_' + test_module)
+    results = []
+    for core in select_cores(module_cores(Path(__file__).resolve().parent / f"{test_module}.py")):
+        results.append(sim_run(test_module, firmware, core))
+    merge_results(results, Path(test_dir) / (test_module.lower() + "_results.xml"))
+
+
+def sim_run(test_module, firmware, core=None, run_name=None):
+    """Build and run the test module(s), with only the given core if any"""
+
+    # No-op if logging is already set up
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    run_name = run_name or test_module
+
     proj_path = Path(__file__).resolve().parent
 
     sources = []
@@ -94,6 +632,9 @@ def sim_setup(test_module, firmware):
         proj_path / "../ip/rggen-verilog-rtl"
     ]
 
+    # Netlists of all cores, or only the enabled one
+    cores = [core] if core else CORES
+
     # SCL models
     sources.append(Path(pdk_root) / pdk / "libs.ref" / scl / "verilog" / "primitives.v")
     sources.append(Path(pdk_root) / pdk / "libs.ref" / scl / "verilog" / f"{scl}.v")
@@ -103,26 +644,19 @@ def sim_setup(test_module, firmware):
         sources.append(proj_path / f"../final/pnl/chip_top.pnl.v")
         
         # Use powered macros
-        sources.append(proj_path / "../macros/frv_1/final/pnl/frv_1.pnl.v")
-        sources.append(proj_path / "../macros/frv_2/final/pnl/frv_2.pnl.v")
-        sources.append(proj_path / "../macros/frv_4/final/pnl/frv_4.pnl.v")
-        sources.append(proj_path / "../macros/frv_8/final/pnl/frv_8.pnl.v")
-        sources.append(proj_path / "../macros/frv_4ccx/final/pnl/frv_4ccx.pnl.v")
-        sources.append(proj_path / "../macros/frv_1bram/final/pnl/frv_1bram.pnl.v")
-        sources.append(proj_path / "../macros/frv_8bram/final/pnl/frv_8bram.pnl.v")
+        for c in cores:
+            sources.append(proj_path / f"../macros/frv_{c}/final/pnl/frv_{c}.pnl.v")
 
         defines = {"FUNCTIONAL": True, "USE_POWER_PINS": True}
     else:
+        # Backdoor of the on-chip RAM banks (Backdoor.ram_write/ram_read)
+        defines["RAM_BACKDOOR"] = True
+
         #sources.append(proj_path / "../src/chip_top.sv")
         #sources.append(proj_path / "../src/chip_core.sv")
         if True:
-            sources.append(proj_path / "../macros/frv_1/frv_1_nl.sv")
-            sources.append(proj_path / "../macros/frv_2/frv_2_nl.sv")
-            sources.append(proj_path / "../macros/frv_4/frv_4_nl.sv")
-            sources.append(proj_path / "../macros/frv_8/frv_8_nl.sv")
-            sources.append(proj_path / "../macros/frv_4ccx/frv_4ccx_nl.sv")
-            sources.append(proj_path / "../macros/frv_1bram/frv_1bram_nl.sv")
-            sources.append(proj_path / "../macros/frv_8bram/frv_8bram_nl.sv")
+            for c in cores:
+                sources.append(proj_path / f"../macros/frv_{c}/frv_{c}_nl.sv")
         else:
             sources.append(proj_path / "../macros/frv_1/frv_1.sv")
             sources.append(proj_path / "../macros/frv_2/frv_2.sv")
@@ -211,6 +745,26 @@ def sim_setup(test_module, firmware):
         "chip_top_tb.sv" if FULL_CHIP is True else "hachure_tb.sv",
     ]
 
+    if core:
+        sources.append(proj_path / "frv_stubs.sv")
+        for c in CORES:
+            if c != core:
+                defines[f"STUB_FRV_{c.upper()}"] = True
+
+
+    for define in filter(None, SIM_DEFINES.split(",")):
+        name, _, value = define.partition("=")
+        defines[name] = value or True
+
+    if SIM_WAVES_SCOPE:
+        defines["DUMP_SCOPE"] = SIM_WAVES_SCOPE
+
+    # Dumping is controlled by the testbench, not by cocotb_iverilog_dump
+    dump_plusargs = ["+dump"]
+    if SIM_WAVES_START:
+        dump_plusargs.append(f"+dump_start={SIM_WAVES_START}")
+    if SIM_WAVES_STOP:
+        dump_plusargs.append(f"+dump_stop={SIM_WAVES_STOP}")
 
     build_args = []
 
@@ -220,28 +774,71 @@ def sim_setup(test_module, firmware):
         pass
 
     if sim == "verilator":
-        build_args = ["--timing", "--trace", "--trace-fst", "--trace-structs"]
+        build_args = ["--timing"]
+        if SIM_WAVES != "0":
+            build_args += ["--trace", "--trace-fst", "--trace-structs"]
+
+    test_dir = os.getenv("SIM_TEST_DIR", 'sim_build_' + run_name)
 
     runner = get_runner(sim)
-    runner.build(
+    build = dict(
         sources=sources,
-        build_dir='sim_build_' + test_module,
         hdl_toplevel=hdl_toplevel,
         defines=defines,
-        always=True,
         includes=includes,
         build_args=build_args,
-        waves=True,
+        waves=sim == "verilator" and SIM_WAVES != "0",
     )
+
+    start = time.monotonic()
+    if SIM_CACHE:
+        key = build_key(sources, defines, includes, build_args, waves=build["waves"])
+        cached_build(runner, SIM_CACHE_DIR / f"{sim}_{hdl_toplevel}_{key}", **build)
+    else:
+        runner.build(build_dir=test_dir, always=True, **build)
+    build_time = time.monotonic() - start
     
-    assert Path(firmware).exists(), "Firmware file not found."
+    firmware = firmware_path(firmware)
+    assert Path(firmware).exists(), f"Firmware file {firmware} not found."
+
+    plusargs = ['+firmware={}'.format(os.path.abspath(firmware))]
+
+    name = run_name.lower() + (f"_{core}" if core else "")
+    extra_env = {
+        "SIM_BUILD_TIME": f"{build_time:.3f}",
+        "SIM_FIRMWARE": os.path.abspath(firmware),
+    }
+    if core:
+        # The model only contains this core
+        extra_env["SIM_CORES"] = core
+
+    dump = SIM_WAVES == "1"
+    results = runner.test(
+        hdl_toplevel=hdl_toplevel,
+        test_module=test_module,
+        test_dir=test_dir,
+        results_xml=name + "_results.xml",
+        plusargs=plusargs + (dump_plusargs if dump else []),
+        waves=dump,
+        extra_env=extra_env | {"SIM_LAUNCH_TIME": f"{time.time():.3f}"},
+    )
+
+    if SIM_WAVES != "fail" or not Path(results).exists():
+        return results
 
-    plusargs = ['-fst', '+firmware={}'.format(os.path.abspath(firmware))]
+    failed = failed_tests(results)
+    if not failed:
+        return results
 
+    runner_log.info(f"Rerunning {len(failed)} failed test(s) with waveforms")
     runner.test(
         hdl_toplevel=hdl_toplevel,
         test_module=test_module,
-        results_xml=test_module.lower() + "_results.xml",
-        plusargs=plusargs,
+        test_dir=test_dir,
+        results_xml=name + "_waves_results.xml",
+        plusargs=plusargs + dump_plusargs,
         waves=True,
+        test_filter="|".join(re.escape(test) + "$" for test in failed),
+        extra_env=extra_env | {"SIM_LAUNCH_TIME": f"{time.time():.3f}"},
     )
+    return results
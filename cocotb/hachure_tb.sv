@@ -205,9 +205,30 @@ qspi_psram #( .DEPTH(RAMSIZE) ) i_qspi_psram (
 );
 
 
+// Waveforms are only dumped with +dump, optionally limited to
+// a scope (DUMP_SCOPE) and a window (+dump_start=<ns>, +dump_stop=<ns>)
+`ifndef DUMP_SCOPE
+  `define DUMP_SCOPE hachure_tb
+`endif
+
+integer dump_start;
+integer dump_stop;
+
+initial begin
+  if ($test$plusargs("dump")) begin
+    $dumpfile("hachure_tb.fst");
+    $dumpvars(0, `DUMP_SCOPE);
+    if ($value$plusargs("dump_start=%d", dump_start)) begin
+      $dumpoff;
+      #(dump_start) $dumpon;
+    end
+  end
+end
+
 initial begin
-  $dumpfile("hachure_tb.fst");
-  $dumpvars(0, hachure_tb);
+  if ($test$plusargs("dump") && $value$plusargs("dump_stop=%d", dump_stop)) begin
+    #(dump_stop) $dumpoff;
+  end
 end
 
 
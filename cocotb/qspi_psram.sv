@@ -61,6 +61,17 @@ initial begin
   end
 end
 
+// Backdoor for the testbench: toggling backdoor_load reads backdoor_file,
+// toggling backdoor_dump writes [backdoor_start, backdoor_end] to it
+logic [1023:0] backdoor_file;
+logic [31:0]   backdoor_start;
+logic [31:0]   backdoor_end;
+logic          backdoor_load = 0;
+logic          backdoor_dump = 0;
+
+always @(backdoor_load) $readmemh(backdoor_file, mem_r);
+always @(backdoor_dump) $writememh(backdoor_file, mem_r, backdoor_start, backdoor_end);
+
 logic [7:0] mem_byte_r, mem_byte_n;
 
 logic qspi_unlocked_n, qspi_unlocked_r = 0;
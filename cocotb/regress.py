@@ -0,0 +1,178 @@
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Regression driver: runs every (test module x core x RTL/GL) combination
+# as its own simulator process and merges the results into one JUnit file.
+
+import os
+import sys
+import json
+import math
+import signal
+import time
+import argparse
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from hachure_defaults import CORES, module_cores
+
+COCOTB_DIR = Path(__file__).resolve().parent
+
+
+class Job:
+
+    def __init__(self, module, core, gl, out_dir):
+        self.module = module
+        self.core = core
+        self.gl = gl
+        self.name = f"{module}-{core}-{'gl' if gl else 'rtl'}"
+        self.dir = out_dir / self.name
+        self.results_xml = self.dir / f"{module}_results.xml"
+        self.returncode = None
+        self.duration = 0.0
+        self.proc = None
+
+    def estimate(self, durations):
+        """Expected runtime used for longest-job-first scheduling"""
+        if self.name in durations:
+            return durations[self.name]
+        # No history: narrow cores and gate-level runs take longest
+        chunk = int(self.core[0])
+        return (10.0 if self.gl else 1.0) / math.log2(1 + chunk)
+
+    def run(self, timeout=None):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        env = dict(os.environ)
+        env["SIM_CORES"] = self.core
+        env["SIM_TEST_DIR"] = str(self.dir)
+        env.pop("GL", None)
+        if self.gl:
+            env["GL"] = "1"
+
+        start = time.monotonic()
+        with open(self.dir / "run.log", "w") as log:
+            # Own process group, so a timeout also stops the simulator started by the test
+            self.proc = subprocess.Popen(
+                [sys.executable, f"{self.module}.py"],
+                cwd=COCOTB_DIR,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+            try:
+                self.returncode = self.proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.kill()
+                log.write(f"\nTimeout after {timeout} s\n")
+                self.returncode = -1
+        self.duration = time.monotonic() - start
+        return self
+
+    def kill(self):
+        """Stop the job with everything it started"""
+        if self.proc and self.proc.poll() is None:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+            self.proc.wait()
+
+
+def job_suites(job):
+    """Testsuite elements of a job, or a synthetic failure if it left no results"""
+    if job.results_xml.exists():
+        try:
+            suites = ET.parse(job.results_xml).getroot().findall("testsuite")
+        except ET.ParseError:
+            suites = []
+        if suites:
+            for suite in suites:
+                suite.set("name", job.name)
+            return suites
+
+    suite = ET.Element("testsuite", name=job.name)
+    case = ET.SubElement(suite, "testcase", name=job.name, classname=job.module, time=f"{job.duration:.2f}")
+    ET.SubElement(case, "failure", message=f"no results (exit code {job.returncode}), see {job.dir / 'run.log'}")
+    return [suite]
+
+
+def failures(suites):
+    return sum(len(case.findall("failure")) + len(case.findall("error"))
+               for suite in suites for case in suite.iter("testcase"))
+
+
+def main(tests, cores, modes, jobs, out_dir, timeout):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    durations_file = out_dir / "durations.json"
+    durations = json.loads(durations_file.read_text()) if durations_file.exists() else {}
+
+    matrix = []
+    for module in tests:
+        for core in module_cores(COCOTB_DIR / f"{module}.py"):
+            if core not in cores:
+                continue
+            for mode in modes:
+                matrix.append(Job(module, core, mode == "gl", out_dir))
+
+    # Longest job first keeps the tail of the schedule short
+    matrix.sort(key=lambda job: job.estimate(durations), reverse=True)
+
+    print(f"Running {len(matrix)} jobs on {jobs} workers")
+
+    root = ET.Element("testsuites", name="regress")
+    n_failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        running = [pool.submit(job.run, timeout) for job in matrix]
+        try:
+            for future in as_completed(running):
+                job = future.result()
+                suites = job_suites(job)
+                root.extend(suites)
+                failed = failures(suites)
+                n_failed += failed > 0
+                durations[job.name] = job.duration
+                status = "FAIL" if failed else "PASS"
+                print(f"[{status}] {job.name:32s} {job.duration:8.1f} s")
+        except KeyboardInterrupt:
+            # The jobs run in their own sessions and do not see the interrupt
+            pool.shutdown(wait=False, cancel_futures=True)
+            for job in matrix:
+                job.kill()
+            raise
+
+    ET.ElementTree(root).write(out_dir / "results.xml", encoding="utf-8", xml_declaration=True)
+    durations_file.write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+    print(f"{len(matrix) - n_failed}/{len(matrix)} jobs passed, results in {out_dir / 'results.xml'}")
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+
+    all_tests = sorted(p.stem for p in COCOTB_DIR.glob("test_*.py"))
+
+    parser = argparse.ArgumentParser(
+        prog="regress", description="Run the cocotb tests in parallel"
+    )
+    parser.add_argument(
+        "--tests", nargs="*", default=all_tests, help="test modules to run"
+    )
+    parser.add_argument(
+        "--cores", nargs="*", default=CORES, help="core variants to run"
+    )
+    parser.add_argument(
+        "--mode", nargs="*", default=["rtl"], choices=["rtl", "gl"], help="RTL and/or gate-level"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count(), help="number of parallel simulations"
+    )
+    parser.add_argument(
+        "--out", type=Path, default=COCOTB_DIR / "sim_build_regress", help="output directory"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="timeout per job in seconds"
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(main(args.tests, args.cores, args.mode, args.jobs, args.out.resolve(), args.timeout))
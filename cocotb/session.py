@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Run several test modules in one simulator process: the model is
+# elaborated once and every test swaps firmware and core in place.
+
+import os
+import ast
+import argparse
+from pathlib import Path
+
+from hachure_defaults import COCOTB_DIR, sim_run
+
+
+def module_firmware(test_file):
+    """FIRMWARE constant of a test module"""
+    tree = ast.parse(Path(test_file).read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "FIRMWARE" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"No FIRMWARE in {test_file}")
+
+
+if __name__ == "__main__":
+
+    all_tests = sorted(p.stem for p in COCOTB_DIR.glob("test_*.py"))
+
+    parser = argparse.ArgumentParser(
+        prog="session", description="Run the cocotb tests in one simulator process"
+    )
+    parser.add_argument(
+        "--tests", nargs="*", default=all_tests, help="test modules to run"
+    )
+
+    args = parser.parse_args()
+
+    # Picked up by the simulator process
+    os.environ["SIM_SESSION"] = "1"
+
+    # The first module's firmware is loaded at elaboration
+    sim_run(args.tests, module_firmware(COCOTB_DIR / f"{args.tests[0]}.py"), run_name="session")
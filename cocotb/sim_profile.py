@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Summarize the profile history written by the cocotb tests: median
+# cycles/s per (test, core, GL) and simulator, fastest simulator last.
+# With --firmware, code size and cycles per firmware build profile.
+# With --cpi/--bench, the CPI per core and code region of test_cpi and the
+# cycles per kernel and code region of test_bench_mem.
+
+import csv
+import argparse
+from pathlib import Path
+from statistics import median
+from collections import defaultdict
+
+from hachure_defaults import COCOTB_DIR, CORES, SIM_PROFILE_FILE, SIM_CPI_FILE, SIM_BENCH_FILE
+
+
+def summarize(rows, last):
+    """Median of the last runs per (test, core, gl) and simulator"""
+    groups = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        if row["result"] != "pass" or not row["cycles_per_s"]:
+            continue
+        groups[(row["test"], row["core"], row["gl"])][row["sim"]].append(row)
+
+    summary = []
+    for key, sims in sorted(groups.items()):
+        stats = {}
+        for sim, runs in sims.items():
+            runs = runs[-last:]
+            stats[sim] = (
+                median(float(r["cycles_per_s"]) for r in runs),
+                median(float(r["wall_s"]) for r in runs),
+                median(float(r["build_s"] or 0) for r in runs),
+                len(runs),
+            )
+        summary.append((key, stats))
+    return summary
+
+
+def main(profile, last):
+    with open(profile, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    print(f"{'test':20s} {'core':6s} {'gl':3s} {'sim':10s} {'cycles/s':>10s} {'wall s':>8s} {'build s':>8s} {'runs':>5s}")
+    for (test, core, gl), stats in summarize(rows, last):
+        fastest = max(stats, key=lambda sim: stats[sim][0])
+        for sim, (cps, wall, build, n) in sorted(stats.items(), key=lambda item: item[1][0]):
+            mark = " *" if sim == fastest and len(stats) > 1 else ""
+            print(f"{test:20s} {core:6s} {gl:3s} {sim:10s} {cps:10.0f} {wall:8.1f} {build:8.1f} {n:5d}{mark}")
+
+
+def pivot(table_file, keys, column, value, last):
+    """Median of the last values per keys (rows) and column, columns in order of appearance"""
+    with open(table_file, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    columns = list(dict.fromkeys(row[column] for row in rows))
+    groups = defaultdict(list)
+    for row in rows:
+        groups[tuple(row[k] for k in keys) + (row[column],)].append(float(row[value]))
+
+    print("".join(f"{k:8s} " for k in keys) + "".join(f" {c:>9s}" for c in columns))
+    for key in dict.fromkeys(key[:-1] for key in groups):
+        values = [groups.get(key + (c,)) for c in columns]
+        print("".join(f"{k:8s} " for k in key) + "".join(f" {median(v[-last:]):9.2f}" if v else f" {'-':>9s}" for v in values))
+
+
+def firmware_sizes(firmware_dir):
+    """text/data/bss of every built image per (test, profile), from the size reports of the build"""
+    sizes = {}
+    for report in sorted(firmware_dir.glob("test_*/build/**/*.size")):
+        build = report.parent
+        profile = "O0" if build.name == "build" else build.name
+        test = build.parent.name if profile == "O0" else build.parent.parent.name
+        text, data, bss = report.read_text().splitlines()[1].split()[:3]
+        sizes.setdefault((test, profile), []).append((report.stem, int(text), int(data), int(bss)))
+    return sizes
+
+
+def firmware_report(profile, firmware_dir, last):
+    """Code size and median simulated cycles per test, firmware profile and core"""
+    with open(profile, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    cycles = defaultdict(list)
+    for row in rows:
+        if row["result"] == "pass":
+            cycles[(row["test"], row.get("fw_profile") or "O0", row["core"])].append(int(row["cycles"]))
+
+    print(f"{'test':20s} {'image':14s} {'profile':7s} {'text':>7s} {'data':>6s} {'bss':>6s}" + "".join(f" {core:>9s}" for core in CORES))
+    for (test, fw_profile), images in sorted(firmware_sizes(firmware_dir).items()):
+        for image, text, data, bss in images:
+            runs = [cycles.get((test, fw_profile, core)) for core in CORES]
+            print(f"{test:20s} {image:14s} {fw_profile:7s} {text:7d} {data:6d} {bss:6d}"
+                  + "".join(f" {median(r[-last:]):9.0f}" if r else f" {'-':>9s}" for r in runs))
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        prog="sim_profile", description="Summarize simulation throughput"
+    )
+    parser.add_argument(
+        "profile", nargs="?", type=Path, default=SIM_PROFILE_FILE, help="profile CSV"
+    )
+    parser.add_argument(
+        "--last", type=int, default=5, help="number of most recent runs to consider"
+    )
+
+    parser.add_argument(
+        "--cpi", action="store_true", help=f"print the CPI per core and code region from {SIM_CPI_FILE.name}"
+    )
+    parser.add_argument(
+        "--firmware", action="store_true", help="print code size and simulated cycles per test and firmware profile"
+    )
+    parser.add_argument(
+        "--bench", action="store_true", help=f"print the cycles per kernel and code region from {SIM_BENCH_FILE.name}"
+    )
+
+    args = parser.parse_args()
+
+    if args.cpi:
+        pivot(SIM_CPI_FILE, ["core", "gl"], "region", "cpi", args.last)
+    elif args.firmware:
+        firmware_report(args.profile, COCOTB_DIR / "../firmware", args.last)
+    elif args.bench:
+        pivot(SIM_BENCH_FILE, ["core", "gl", "defines", "data", "kernel"], "code", "cycles", args.last)
+    else:
+        main(args.profile, args.last)
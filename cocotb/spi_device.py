@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import Timer, RisingEdge, FallingEdge
+
+
+class SpiDevice:
+    """
+    SPI device model:
+      * CPOL/CPHA configurable, MSB first
+      * Bits are shifted into integer words of `bits` bits
+      * A frame ends on the rising edge of CS, or after `frame_bits`
+        bits if there is no CS (e.g. the OLED DMA)
+      * Frames are lists of words delivered through the bounded `frames` queue,
+        frames arriving while it is full are dropped and counted in `overflows`
+      * MISO either loops MOSI back or shifts out scripted response words,
+        driven `latency_ns` after the shift edge
+    """
+
+    def __init__(self, sck, mosi, miso=None, cs=None, cpol=0, cpha=0, bits=8,
+                 frame_bits=None, loopback=True, responses=(), latency_ns=20, queue_size=16):
+        assert cs is not None or frame_bits, "frames without CS need a fixed length"
+        self.sck = sck
+        self.mosi = mosi
+        self.miso = miso
+        self.cs = cs
+        self.bits = bits
+        self.frame_bits = frame_bits
+        self.loopback = loopback
+        self.responses = list(responses)
+        self.latency_ns = latency_ns
+        self.frames = Queue(maxsize=queue_size)
+        self.overflows = 0
+
+        # Modes 0 and 3 sample on the rising edge
+        sample_rising = cpol == cpha
+        self._sample_edge = RisingEdge if sample_rising else FallingEdge
+        self._shift_edge = FallingEdge if sample_rising else RisingEdge
+        self._cpha = cpha
+
+        self._active = cs is None
+        self._words = []
+        self._word = 0
+        self._count = 0
+        self._tx = 0
+        self._tx_count = 0
+
+    def start(self):
+        cocotb.start_soon(self._receive())
+        if self.cs is not None:
+            cocotb.start_soon(self._frame())
+        if self.miso is not None:
+            cocotb.start_soon(self._transmit())
+        return self
+
+    def _end_frame(self):
+        if self._count % self.bits:
+            self._words.append(self._word)
+        if self._words:
+            cocotb.log.info(f"SPI frame received: {self._count} bits")
+            if self.frames.full():
+                self.overflows += 1
+                cocotb.log.warning(f"SPI frame dropped, queue full ({self.overflows} dropped)")
+            else:
+                self.frames.put_nowait(self._words)
+        self._words = []
+        self._word = 0
+        self._count = 0
+
+    async def _receive(self):
+        sample_edge = self._sample_edge(self.sck)
+        while True:
+            await sample_edge
+            if not self._active:
+                continue
+            self._word = ((self._word << 1) | int(self.mosi.value)) & ((1 << self.bits) - 1)
+            self._count += 1
+            if self._count % self.bits == 0:
+                self._words.append(self._word)
+                self._word = 0
+            if self.frame_bits and self._count == self.frame_bits:
+                self._end_frame()
+
+    async def _frame(self):
+        while True:
+            await FallingEdge(self.cs)
+            self._active = True
+            self._tx_count = 0
+            if self._cpha == 0:
+                # First bit is expected before the first clock edge
+                await self._drive()
+            await RisingEdge(self.cs)
+            self._active = False
+            self._end_frame()
+
+    async def _drive(self):
+        """Drive the next MISO bit after the configured latency"""
+        if self.latency_ns:
+            await Timer(self.latency_ns, "ns")
+        if self.loopback:
+            self.miso.value = self.mosi.value
+            return
+        if self._tx_count % self.bits == 0:
+            self._tx = self.responses.pop(0) if self.responses else 0
+        self.miso.value = (self._tx >> (self.bits - 1 - self._tx_count % self.bits)) & 1
+        self._tx_count += 1
+
+    async def _transmit(self):
+        shift_edge = self._shift_edge(self.sck)
+        while True:
+            await shift_edge
+            if self._active:
+                await self._drive()
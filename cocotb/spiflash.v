@@ -108,6 +108,30 @@ module spiflash (
 		$readmemh(firmware_file, memory);
 	end
 
+	// Backdoor for the testbench: toggling backdoor_load reads backdoor_file,
+	// toggling backdoor_dump writes [backdoor_start, backdoor_end] to it
+	reg [1023:0] backdoor_file;
+	reg [31:0] backdoor_start;
+	reg [31:0] backdoor_end;
+	reg backdoor_load = 0;
+	reg backdoor_dump = 0;
+
+	always @(backdoor_load)
+		$readmemh(backdoor_file, memory);
+
+	always @(backdoor_dump)
+		$writememh(backdoor_file, memory, backdoor_start, backdoor_end);
+
+	// Sparse images leave gaps undefined, read them as zero like dense images
+	function [7:0] read_byte;
+		input [23:0] addr;
+		begin
+			read_byte = memory[addr];
+			if (^read_byte === 1'bx)
+				read_byte = 8'h00;
+		end
+	endfunction
+
 	task spi_action;
 		begin
 			spi_in = buffer;
@@ -136,7 +160,7 @@ module spiflash (
 					spi_addr[7:0] = buffer;
 
 				if (bytecount >= 4) begin
-					buffer = memory[spi_addr];
+					buffer = read_byte(spi_addr);
 					spi_addr = spi_addr + 1;
 				end
 			end
@@ -161,7 +185,7 @@ module spiflash (
 				end
 
 				if (bytecount >= 5) begin
-					buffer = memory[spi_addr];
+					buffer = read_byte(spi_addr);
 					spi_addr = spi_addr + 1;
 				end
 			end
@@ -186,7 +210,7 @@ module spiflash (
 				end
 
 				if (bytecount >= 5) begin
-					buffer = memory[spi_addr];
+					buffer = read_byte(spi_addr);
 					spi_addr = spi_addr + 1;
 				end
 			end
@@ -211,7 +235,7 @@ module spiflash (
 				end
 
 				if (bytecount >= 5) begin
-					buffer = memory[spi_addr];
+					buffer = read_byte(spi_addr);
 					spi_addr = spi_addr + 1;
 				end
 			end
@@ -0,0 +1,46 @@
+
+import os
+import math
+import logging
+from pathlib import Path
+
+import cocotb
+
+from hachure_defaults import *
+
+TEST_MODULE = "test_backdoor"
+FIRMWARE = '../firmware/test_sram_simple/build/firmware.hex'
+# Swapped in through the backdoor from the raw objcopy output
+IMAGE = '../firmware/test_xip/build/firmware.bin'
+
+FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
+
+
+@cocotb.parametrize(core=select_cores(["8"]))
+@profiled
+async def test_backdoor_bin(dut, core):
+    logger = logging.getLogger(TEST_MODULE)
+    logger.info("Startup sequence...")
+    await start_up(dut, core, from_reset=True, firmware=IMAGE)
+
+    # The flash holds exactly the .bin image
+    image = (COCOTB_DIR / firmware_path(IMAGE)).read_bytes()
+    backdoor = Backdoor(dut)
+    for flash in backdoor.flashes():
+        assert await backdoor.flash_read(0, len(image), flash) == image
+
+    logger.info("Running the test...")
+
+    # and the swapped firmware runs, test_xip reports 5
+    assert await wait_done(dut, 30000//int(math.log2(1+int(core[0])))) == 5
+
+    if not gl:
+        # Unaligned and across the boundary of the first two RAM banks
+        before = await backdoor.ram_read(2040, 25)
+        pattern = bytes(range(1, 24))
+        await backdoor.ram_write(2041, pattern)
+        assert await backdoor.ram_read(2040, 25) == before[:1] + pattern + before[-1:]
+
+
+if __name__ == "__main__":
+    sim_setup(TEST_MODULE, FIRMWARE)
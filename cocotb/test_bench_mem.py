@@ -0,0 +1,64 @@
+
+import math
+import time
+import logging
+
+import cocotb
+
+from hachure_defaults import *
+
+TEST_MODULE = "test_bench_mem"
+
+FIRMWARE = '../firmware/test_bench_mem/build/firmware_rom.hex'
+
+# One firmware per code region of the kernels, see firmware/test_bench_mem/bench.ld
+FIRMWARES = {code: FIRMWARE.replace("_rom", f"_{code}") for code in ("rom", "xip", "sram", "ram")}
+
+# Must match firmware/test_bench_mem/main.c, runs are numbered on GPO in this order
+DATA = ["ram", "sram"]
+KERNELS = ["memcpy", "crc", "matmul"]
+
+
+@cocotb.parametrize(
+    core=select_cores(["1", "8", "8bram"]),
+    code=list(FIRMWARES),
+)
+@profiled
+async def test_bench_mem(dut, core, code):
+    logger = logging.getLogger(TEST_MODULE)
+    logger.info("Startup sequence...")
+    await start_up(dut, core, from_reset=True, firmware=FIRMWARES[code])
+
+    # Each run is framed by GPO[2:0] going to its number and back to 0
+    runs = [(data, kernel) for data in DATA for kernel in KERNELS]
+    markers = SignalMonitor(gpo_signal(dut), mask=SIM_DONE_FLAG - 1).start()
+
+    logger.info("Running the test...")
+
+    timeout_ns = 4000000//int(math.log2(1+int(core[0]))) * CLK_PERIOD_NS
+    await with_timeout(markers.wait_transitions(2 * len(runs)), timeout_ns, "ns")
+    markers.stop()
+
+    rows = []
+    for index, (data, kernel) in enumerate(runs):
+        start, end = markers.timestamps[2 * index:2 * index + 2]
+        cycles = round((end - start) / CLK_PERIOD_NS)
+        rows.append({
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "core": core,
+            "sim": sim,
+            "gl": int(bool(gl)),
+            "defines": SIM_DEFINES,
+            "code": code,
+            "data": data,
+            "kernel": kernel,
+            "cycles": cycles,
+        })
+        logger.info(f"[RESULT] core {core}, code in {code}, data in {data}: {kernel} took {cycles} cycles")
+    append_csv(SIM_BENCH_FILE, BENCH_FIELDS, rows)
+
+    assert await wait_done(dut, 10000) == 1
+
+
+if __name__ == "__main__":
+    sim_setup(TEST_MODULE, FIRMWARE)
@@ -0,0 +1,106 @@
+
+import os
+import math
+import time
+import random
+import logging
+from pathlib import Path
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Timer, Edge, RisingEdge, FallingEdge, ClockCycles, ReadOnly
+
+from hachure_defaults import *
+
+TEST_MODULE = "test_cpi"
+FIRMWARE = '../firmware/test_cpi/build/firmware.hex'
+
+FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
+
+# Must match the regions in firmware/test_cpi/main.c, GPO is the index + 1
+REGIONS = ["flash", "xip", "qspi_ram", "ram"]
+
+
+class FetchCounter:
+    """Count instruction fetches (imem stb & ack cycles) of a core, one fetch per retired instruction"""
+
+    def __init__(self, clk, stb, ack):
+        self.clk = clk
+        self.stb = stb
+        self.ack = ack
+        self.count = 0
+
+    async def _count(self):
+        clock_edge = RisingEdge(self.clk)
+        while True:
+            if self.ack.value != 1:
+                await RisingEdge(self.ack)
+            await ReadOnly()
+            # Back-to-back fetches keep ack high, count every cycle with stb & ack
+            while self.ack.value == 1:
+                if self.stb.value == 1:
+                    self.count += 1
+                await clock_edge
+                await ReadOnly()
+
+    def start(self):
+        self._task = cocotb.start_soon(self._count())
+        return self
+
+    def stop(self):
+        self._task.cancel()
+
+
+async def wait_gpo(gpo, value):
+    """Wait for a region marker on GPO[2:0] with the done flag GPO[3] clear"""
+    while not (gpo.value.is_resolvable and int(gpo.value) & (2 * SIM_DONE_FLAG - 1) == value):
+        await Edge(gpo)
+
+
+# Fetches are counted on the internal bus of the core, which the gate-level netlist does not keep
+@cocotb.test(skip=bool(gl))
+@cocotb.parametrize(core=select_cores(["1", "2", "4", "8", "4ccx", "1bram", "8bram"]))
+@profiled
+async def test_cpi(dut, core):
+    logger = logging.getLogger(TEST_MODULE)
+    logger.info("Startup sequence...")
+    # Every core starts from reset, GPO must not hold the SIM_DONE code of the previous one
+    await start_up(dut, core, from_reset=True, firmware=FIRMWARE)
+
+    soc = Backdoor(dut).soc
+    fetches = FetchCounter(dut.clk, getattr(soc, f"wb_c_frv_{core}_imem_stb"),
+                           getattr(soc, f"wb_c_frv_{core}_imem_ack")).start()
+    gpo = gpo_signal(dut)
+
+    logger.info("Running the test...")
+
+    timeout_ns = 2000000//int(math.log2(1+int(core[0]))) * CLK_PERIOD_NS
+    rows = []
+    for index, region in enumerate(REGIONS):
+        await with_timeout(wait_gpo(gpo, index + 1), timeout_ns, "ns")
+        start_ns, start_fetches = get_sim_time("ns"), fetches.count
+        await with_timeout(wait_gpo(gpo, 0), timeout_ns, "ns")
+        sim_ns, instructions = get_sim_time("ns") - start_ns, fetches.count - start_fetches
+
+        cycles = round(sim_ns / CLK_PERIOD_NS)
+        rows.append({
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "core": core,
+            "sim": sim,
+            "gl": int(bool(gl)),
+            "region": region,
+            "instructions": instructions,
+            "cycles": cycles,
+            "cpi": f"{cycles / instructions:.2f}",
+            "runtime_us": f"{sim_ns / 1000:.1f}",
+        })
+        logger.info(f"[RESULT] core {core} from {region}: {instructions} instructions in {cycles} cycles, "
+                    f"CPI {cycles / instructions:.2f}")
+    fetches.stop()
+    append_csv(SIM_CPI_FILE, CPI_FIELDS, rows)
+
+    assert await wait_done(dut, 10000) == 1
+
+
+if __name__ == "__main__":
+    sim_setup(TEST_MODULE, FIRMWARE)
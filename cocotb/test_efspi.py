@@ -8,12 +8,9 @@ from pathlib import Path
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import Timer, Edge, RisingEdge, FallingEdge, ClockCycles, ReadOnly
-from collections import deque
-from cocotb.triggers import Edge
-from cocotb.triggers import First
-from cocotb.queue import Queue
 
 from hachure_defaults import *
+from spi_device import SpiDevice
 
 TEST_MODULE = "test_efspi"
 FIRMWARE = '../firmware/test_efspi/build/firmware.hex'
@@ -22,100 +19,26 @@ FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
 
 first_test = True
 
-from cocotb.queue import Queue
-
-
-class SpiDevice:
-    """
-    Minimal SPI slave device:
-      * CPOL=0, CPHA=0 (sample MOSI on rising SCLK)
-      * Loopback = drive same bits on MISO
-      * Collect bits MSB-first
-      * On rising edge of CS -> end of frame -> assertion/logging
-    """
-
-    def __init__(self, dut):
-        self.dut = dut
-        self.bit_buffer = []
-        self.frame_done = Queue()
-
-    async def run(self):
-        """Main coroutine to handle SPI traffic."""
-        dut = self.dut
-     
-        cocotb.start_soon(self._monitor_cs())
-        cocotb.start_soon(self._monitor_sclk())
-        cocotb.start_soon(self._loopback())
-        
-    async def _loopback(self):
-        dut = self.dut
-        while True:
-            await First(Edge(dut.efspi_sck), Edge(dut.efspi_cs))
-            await RisingEdge(dut.clk)
-            await RisingEdge(dut.clk)
-            dut.efspi_sdi.value = dut.efspi_sdo.value
-    
-    
-    async def _monitor_sclk(self):
-        dut = self.dut
-        while True:
-            await RisingEdge(dut.efspi_sck)
-            
-            if dut.efspi_cs.value == 0:  # active low
-                bit = int(dut.efspi_sdo.value)
-                self.bit_buffer.append(bit)
-
-
-    async def _monitor_cs(self):
-        dut = self.dut
-
-        while True:
-            await RisingEdge(dut.efspi_cs)
-
-            if self.bit_buffer:
-                # Convert list of bits to integer (MSB-first)
-                value = 0
-                for b in self.bit_buffer:
-                    value = (value << 1) | b
-
-                dut._log.info(f"SPI frame received: {len(self.bit_buffer)} bits -> 0x{value:X}")
-                await self.frame_done.put(value)
-
-                self.bit_buffer = []
-
-
-    
-async def wait_until_nonzero(signal):
-    while True:
-        await Edge(signal)
-        await ReadOnly()
-        if int(signal.value) != 0:
-            return int(signal.value)
 
 #
-@cocotb.parametrize(core=["8bram"])
+@cocotb.parametrize(core=select_cores(["8bram"]))
+@profiled
 async def test_efspi(dut, core):
     global first_test
     logger = logging.getLogger(TEST_MODULE)
     logger.info("Startup sequence...")
-    await start_up(dut, core, from_reset=first_test)
+    await start_up(dut, core, from_reset=first_test, firmware=FIRMWARE)
     first_test = False
-    spi = SpiDevice(dut)
-    cocotb.start_soon(spi.run())
+    spi = SpiDevice(dut.efspi_sck, dut.efspi_sdo, miso=dut.efspi_sdi, cs=dut.efspi_cs).start()
     
     logger.info("Running the test...")
     
-    received_value = await spi.frame_done.get()
+    timeout_cycles = 30000//int(math.log2(1+int(core[0])))
+    frame = await with_timeout(spi.frames.get(), timeout_cycles * CLK_PERIOD_NS, "ns")
 
-    assert received_value == 0x1D
-    #
-    if FULL_CHIP:
-        val = await wait_until_nonzero(dut.gpio)
-    else:
-        val = await wait_until_nonzero(dut.gpo)
-    
-    assert val == 1
-    #await ClockCycles(dut.clk, 30000//int(math.log2(1+int(core[0]))))
+    assert frame == [0x1D]
+
+    assert await wait_done(dut, timeout_cycles) == 1
 
         
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+
+import os
+import math
+import random
+import logging
+from pathlib import Path
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.queue import Queue
+from cocotb.triggers import Timer, Edge, RisingEdge, FallingEdge, ClockCycles, ReadOnly
+
+from hachure_defaults import *
+from spi_device import SpiDevice
+
+TEST_MODULE = "test_oled"
+FIRMWARE = '../firmware/test_oled/build/firmware.hex'
+
+FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
+
+# Must match firmware/test_oled/main.c
+FRAME_BYTES = 64
+FRAMES = {"sram": 0x10000000, "ram": 0x20002000}
+TRANSFERS = [(source, presc) for source in FRAMES for presc in (1, 2, 4)]
+
+first_test = True
+
+
+class DmaMonitor:
+    """
+    Per-transfer statistics of the OLED DMA, woken only by edges of its
+    ready, stb and ack signals. Stall cycles are cycles with stb high
+    but no ack, i.e. waiting for the memory or for the CPU to leave the bus.
+    """
+
+    def __init__(self, dma):
+        self.dma = dma
+        self.transfers = Queue(maxsize=len(TRANSFERS))
+        self._requests = 0
+        self._stall = 0
+
+    def start(self):
+        cocotb.start_soon(self._bus())
+        cocotb.start_soon(self._transfer())
+        return self
+
+    async def _bus(self):
+        stb, ack = self.dma.wbm_spi_stb_o, self.dma.wbm_spi_ack_i
+        while True:
+            if stb.value != 1:
+                await RisingEdge(stb)
+            start = get_sim_time("ns")
+            await RisingEdge(ack)
+            self._stall += round((get_sim_time("ns") - start) / CLK_PERIOD_NS)
+            self._requests += 1
+            # stb of a back-to-back request is only valid once ack dropped
+            await FallingEdge(ack)
+            await ReadOnly()
+
+    async def _transfer(self):
+        rdy = self.dma.rdy_o
+        while True:
+            await FallingEdge(rdy)
+            start = get_sim_time("ns")
+            self._requests = 0
+            self._stall = 0
+            await RisingEdge(rdy)
+            self.transfers.put_nowait({
+                "ns": get_sim_time("ns") - start,
+                "requests": self._requests,
+                "stall_cycles": self._stall,
+            })
+
+
+@cocotb.parametrize(core=select_cores(["8", "8bram"]))
+@profiled
+async def test_oled(dut, core):
+    global first_test
+    logger = logging.getLogger(TEST_MODULE)
+    logger.info("Startup sequence...")
+    await start_up(dut, core, from_reset=first_test, firmware=FIRMWARE)
+    first_test = False
+
+    # SPI mode 0, no CS: one frame per DMA transfer
+    oled = SpiDevice(dut.oled_spi_sck, dut.oled_spi_sdo, frame_bits=FRAME_BYTES * 8).start()
+    backdoor = Backdoor(dut)
+    dma = None if gl else getattr(backdoor.soc, "i_tiny_wb_dma_oled_spi", None)
+    monitor = DmaMonitor(dma).start() if dma is not None else None
+
+    logger.info("Running the test...")
+
+    timeout_cycles = 100000//int(math.log2(1+int(core[0])))
+    for source, presc in TRANSFERS:
+        frame = await with_timeout(oled.frames.get(), timeout_cycles * CLK_PERIOD_NS, "ns")
+
+        address = FRAMES[source]
+        if source == "sram":
+            expected = await backdoor.psram_read(address, FRAME_BYTES)
+        else:
+            # The on-chip RAM is not accessible in the GL netlist
+            expected = None if gl else await backdoor.ram_read(address, FRAME_BYTES)
+        if expected is not None:
+            assert bytes(frame) == expected, f"Frame from {source} with presc {presc} differs from the source buffer"
+
+        if monitor is None:
+            continue
+        stats = await monitor.transfers.get()
+        # A half SCK period lasts presc*8+1 cycles
+        ideal_ns = FRAME_BYTES * 8 * 2 * (presc * 8 + 1) * CLK_PERIOD_NS
+        logger.info(f"[RESULT] {source} presc {presc}: {FRAME_BYTES / (stats['ns'] * 1e-9):.0f} bytes/s "
+                    f"({ideal_ns / stats['ns']:.0%} of SCK limit), "
+                    f"{stats['stall_cycles']} stall cycles in {stats['requests']} requests")
+
+    assert await wait_done(dut, timeout_cycles) == 1
+
+
+if __name__ == "__main__":
+    sim_setup(TEST_MODULE, FIRMWARE)
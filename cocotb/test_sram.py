@@ -19,21 +19,19 @@ FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
 
 first_test = True
 
-@cocotb.parametrize(core=["1", "2", "4", "8", "4ccx", "1bram", "8bram"])
+@cocotb.parametrize(core=select_cores(["1", "2", "4", "8", "4ccx", "1bram", "8bram"]))
+@profiled
 async def test_sram(dut, core):
     global first_test
     logger = logging.getLogger(TEST_MODULE)
     logger.info("Startup sequence...")
-    await start_up(dut, core, from_reset=first_test)
+    await start_up(dut, core, from_reset=first_test, firmware=FIRMWARE)
     first_test = False
     logger.info("Running the test...")
 
-    await ClockCycles(dut.clk, 300000//int(math.log2(1+int(core[0]))))
-    
-    if not FULL_CHIP:
-        assert int(dut.gpo.value) == 7
-    else:
-        assert int(dut.gpio.value) == 7
+    code = await wait_done(dut, 300000//int(math.log2(1+int(core[0]))))
+
+    assert code == 7
     
 if __name__ == "__main__":
     sim_setup(TEST_MODULE, FIRMWARE)
\ No newline at end of file
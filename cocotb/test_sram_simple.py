@@ -19,21 +19,24 @@ FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
 
 first_test = True
 
-@cocotb.parametrize(core=["1", "2", "4", "8", "4ccx", "1bram", "8bram"])
+@cocotb.parametrize(core=select_cores(["1", "2", "4", "8", "4ccx", "1bram", "8bram"]))
+@profiled
 async def test_sram_simple(dut, core):
     global first_test
     logger = logging.getLogger(TEST_MODULE)
     logger.info("Startup sequence...")
-    await start_up(dut, core, from_reset=first_test)
+    await start_up(dut, core, from_reset=first_test, firmware=FIRMWARE)
     first_test = False
     logger.info("Running the test...")
 
-    await ClockCycles(dut.clk, 30000//int(math.log2(1+int(core[0]))))
-    
-    if not FULL_CHIP:
-        assert int(dut.gpo.value) == 5
-    else:
-        assert int(dut.gpio.value) == 5
+    code = await wait_done(dut, 30000//int(math.log2(1+int(core[0]))))
+
+    assert code == 5
+
+    # Check the PSRAM contents directly
+    backdoor = Backdoor(dut)
+    assert await backdoor.psram_read(4*10, 4) == (0xFF00FF00).to_bytes(4, "little")
+    assert await backdoor.psram_read(4*1024, 4) == (0x871A2192).to_bytes(4, "little")
     
 if __name__ == "__main__":
     sim_setup(TEST_MODULE, FIRMWARE)
\ No newline at end of file
@@ -18,12 +18,13 @@ FULL_CHIP = os.getenv("SIM_FULL_CHIP", "1") == "1"
 
 first_test = True
 
-@cocotb.parametrize(core=["1", "2", "4", "8", "4ccx", "1bram", "8bram"])
+@cocotb.parametrize(core=select_cores(["1", "2", "4", "8", "4ccx", "1bram", "8bram"]))
+@profiled
 async def test_toggle(dut, core):
     global first_test
     logger = logging.getLogger(TEST_MODULE)
     logger.info("Startup sequence...")
-    await start_up(dut, core, from_reset=first_test)
+    await start_up(dut, core, from_reset=first_test, firmware=FIRMWARE)
     first_test = False
     logger.info("Running the test...")
     
@@ -31,36 +32,14 @@ async def test_toggle(dut, core):
         gpio_val = str(dut.gpio.value)
         assert all(bit == 'Z' for bit in gpio_val)
 
-    toggle_count = 0
-    async def mon():
-        nonlocal toggle_count
-        
-        if FULL_CHIP:
-            val = dut.gpio.value[0]
-            if "Z" in str(val):
-                prev_val = 0
-            else:
-                prev_val = int(val)
-        else:
-            prev_val = int(dut.gpo.value[0])
-        
-        while True:
-            await RisingEdge(dut.clk)
-            if FULL_CHIP:
-                val = dut.gpio.value[0]
-                if "Z" in str(val):
-                    curr_val = 0
-                else:
-                    curr_val = int(val)
-            else:
-                curr_val = int(dut.gpo.value[0])
-            if curr_val != prev_val:
-                toggle_count += 1
-            prev_val = curr_val
-    
-    monitor_task = cocotb.start_soon(mon())
-    await ClockCycles(dut.clk, 15000//int(math.log2(1+int(core[0]))))
-    monitor_task.cancel()
+    # Done as soon as enough toggles are seen, the cycle budget is only a ceiling
+    monitor = SignalMonitor(gpo_signal(dut), mask=0x1).start()
+    try:
+        await with_timeout(monitor.wait_transitions(11), 15000//int(math.log2(1+int(core[0]))) * CLK_PERIOD_NS, "ns")
+    except SimTimeoutError:
+        pass
+    monitor.stop()
+    toggle_count = monitor.transitions
 
     logger.info("[RESULT] GPO[0] toggled {} times.".format(toggle_count))
     assert toggle_count > 10
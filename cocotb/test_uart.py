@@ -18,25 +18,25 @@ FIRMWARE = '../firmware/test_uart/build/firmware.hex'
 
 first_test = True
 
-@cocotb.parametrize(core=["1", "2", "4", "8", "4ccx", "1bram", "8bram"])
+@cocotb.parametrize(core=select_cores(["1", "2", "4", "8", "4ccx", "1bram", "8bram"]))
+@profiled
 async def test_uart(dut, core):
     global first_test
     logger = logging.getLogger(TEST_MODULE)
     logger.info("Startup sequence...")
-    await start_up(dut, core, from_reset=first_test)
+    await start_up(dut, core, from_reset=first_test, firmware=FIRMWARE)
     first_test = False
     logger.info("Running the test...")
     
     uart_source = UartSource(dut.uart_rx, baud=115200, bits=8)
     uart_sink = UartSink(dut.uart_tx, baud=115200, bits=8)
 
-    await ClockCycles(dut.clk, 50000//int(math.log2(1+int(core[0]))))
+    # Firmware signals when the UART is set up
+    assert await wait_done(dut, 50000//int(math.log2(1+int(core[0])))) == 1
         
     await uart_source.write(b'C')
     
-    await ClockCycles(dut.clk, 40000)
-    
-    data = await uart_sink.read(1)
+    data = await with_timeout(uart_sink.read(1), 40000 * CLK_PERIOD_NS, "ns")
 
     assert data == b'C'
 
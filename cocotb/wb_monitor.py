@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+from collections import Counter
+from pathlib import Path
+
+import yaml
+import cocotb
+from cocotb.triggers import RisingEdge, ReadOnly
+from cocotb.utils import get_sim_time
+
+WB_CONFIG = Path(__file__).resolve().parent / "../config/intercon/wb.yml"
+
+
+def load_intercon(config=WB_CONFIG):
+    """Hosts and device address windows of the interconnect"""
+    with open(config) as f:
+        params = yaml.safe_load(f)["parameters"]
+    devices = {name: (dev["offset"], dev["offset"] + dev["size"]) for name, dev in params["devices"].items()}
+    return list(params["hosts"]), devices
+
+
+class WishboneStats:
+    """Transaction statistics of one host/device pair"""
+
+    def __init__(self):
+        self.transactions = 0
+        self.writes = 0
+        self.bytes = 0
+        self.wait_states = 0
+        self.latency = Counter()
+
+    def add(self, latency, write, nbytes):
+        self.transactions += 1
+        self.writes += write
+        self.bytes += nbytes
+        # A zero wait state classic cycle is acknowledged in its first cycle
+        self.wait_states += max(latency - 1, 0)
+        self.latency[latency] += 1
+
+    def row(self):
+        cycles = sum(latency * count for latency, count in self.latency.items())
+        return {
+            "transactions": self.transactions,
+            "reads": self.transactions - self.writes,
+            "writes": self.writes,
+            "bytes": self.bytes,
+            "wait_states": self.wait_states,
+            "mean_latency": f"{cycles / self.transactions:.2f}" if self.transactions else "",
+            "max_latency": max(self.latency, default=""),
+            "histogram": " ".join(f"{latency}:{count}" for latency, count in sorted(self.latency.items())),
+        }
+
+
+class WishboneMonitor:
+    """
+    Records stb->ack latency, wait states and bytes of every classic
+    Wishbone transfer on one port, per device if an address decode is given.
+    Woken by edges of stb and ack, and by the clock only while ack is high,
+    so back-to-back transfers with ack held high count once per cycle.
+    """
+
+    def __init__(self, name, clk, stb, ack, adr, we=None, sel=None, devices=None, period_ns=10):
+        self.name = name
+        self.clk = clk
+        self.stb = stb
+        self.ack = ack
+        self.adr = adr
+        self.we = we
+        self.sel = sel
+        self.devices = devices or {}
+        self.period_ns = period_ns
+        self.stats = {}
+        self._task = None
+
+    @classmethod
+    def host(cls, intercon, host, clk, devices=None, **kwargs):
+        """Monitor a host port of the generated wb_intercon"""
+        return cls(host, clk, *(getattr(intercon, f"wb_{host}_{port}") for port in
+                                ("stb_i", "ack_o", "adr_i", "we_i", "sel_i")), devices=devices, **kwargs)
+
+    @classmethod
+    def device(cls, intercon, device, clk, **kwargs):
+        """Monitor a device port of the generated wb_intercon"""
+        return cls(device, clk, *(getattr(intercon, f"wb_{device}_{port}") for port in
+                                  ("stb_o", "ack_i", "adr_o", "we_o", "sel_o")), **kwargs)
+
+    def decode(self, address):
+        if address is None:
+            return "?"
+        for device, (start, end) in self.devices.items():
+            if start <= address < end:
+                return device
+        return "-" if not self.devices else "?"
+
+    def sample(self, signal, default):
+        value = signal.value if signal is not None else None
+        return int(value) if value is not None and value.is_resolvable else default
+
+    def _transfer(self, latency):
+        address = self.sample(self.adr, None)
+        write = self.sample(self.we, 0)
+        nbytes = bin(self.sample(self.sel, 0xF)).count("1") or 4
+        self.stats.setdefault(self.decode(address), WishboneStats()).add(latency, write, nbytes)
+
+    async def _monitor(self):
+        clock_edge = RisingEdge(self.clk)
+        while True:
+            if self.stb.value != 1:
+                await RisingEdge(self.stb)
+                await ReadOnly()
+            start = get_sim_time("ns")
+
+            if self.ack.value != 1:
+                await RisingEdge(self.ack)
+                await ReadOnly()
+            latency = round((get_sim_time("ns") - start) / self.period_ns)
+
+            # One transfer per cycle with stb & ack, the ones after the
+            # first are acknowledged in their first cycle
+            while self.ack.value == 1:
+                if self.stb.value == 1:
+                    self._transfer(latency)
+                    latency = 1
+                await clock_edge
+                await ReadOnly()
+
+    def start(self):
+        self._task = cocotb.start_soon(self._monitor())
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def rows(self):
+        """One summary row per device seen by this port"""
+        return [{"port": self.name, "device": device, **stats.row()}
+                for device, stats in sorted(self.stats.items())]
@@ -0,0 +1,68 @@
+# Firmware build shared by the test_*/Makefile
+#
+#   PROFILE  O0 (default), Os or O2. Other profiles than O0 build into
+#            build/<PROFILE>, use FW_PROFILE=<PROFILE> to simulate them.
+#   ARCH     Value of -march. All FazyRV variants implement RV32I only,
+#            i.e., there is no core to run rv32ic builds on yet.
+
+PROFILE ?= O0
+ARCH    ?= rv32i
+
+FIRMWARE_FILES ?= $(wildcard *.c)
+PYTHON = python3
+
+GCC_WARNS  = -Werror -Wall -Wextra -Wshadow -Wundef -Wpointer-arith -Wcast-qual -Wcast-align -Wwrite-strings
+TOOLCHAIN_PREFIX = riscv32-unknown-elf-
+
+MAKEHEX = ../makehex.py
+LINK   ?= ../riscv.ld
+START  ?= start.S
+
+ifeq ($(PROFILE),O0)
+BUILD_DIR = build
+else ifneq ($(filter $(PROFILE),Os O2),)
+BUILD_DIR = build/$(PROFILE)
+# Drop unused code and data, and never emit memcpy/memset calls: there is no libc
+OPT_FLAGS = -ffunction-sections -fdata-sections -fno-tree-loop-distribute-patterns
+LD_FLAGS  = -Wl,--gc-sections
+else
+$(error Unknown PROFILE $(PROFILE), use O0, Os or O2)
+endif
+
+CFLAGS = -$(PROFILE) $(OPT_FLAGS) -mabi=ilp32 -march=$(ARCH) -ffreestanding -nostdlib
+
+# Images to build, each linked with $(LINK) (evaluated per image, $* is its name)
+# and relinked when it or a file in LINK_DEPS (e.g. included scripts) changes
+IMAGES ?= firmware
+LINK_DEPS ?=
+
+all: $(foreach image,$(IMAGES),$(BUILD_DIR)/$(image).hex)
+
+$(BUILD_DIR)/%.hex: $(BUILD_DIR)/%.bin $(MAKEHEX)
+	$(PYTHON) $(MAKEHEX) $< 4096 > $@
+
+$(BUILD_DIR)/%.bin: $(BUILD_DIR)/%.elf
+	$(TOOLCHAIN_PREFIX)objcopy -O binary $< $@
+	chmod -x $@
+
+.SECONDEXPANSION:
+$(BUILD_DIR)/%.elf: $(FIRMWARE_FILES) $(BUILD_DIR)/start.o $$(LINK) $(LINK_DEPS)
+	$(TOOLCHAIN_PREFIX)gcc $(CFLAGS) -o $@ \
+		-Wl,--build-id=none,-Bstatic,-T$(LINK),-Map,$(BUILD_DIR)/$*.map,--strip-debug $(LD_FLAGS) \
+		$(BUILD_DIR)/start.o $(FIRMWARE_FILES) -lgcc
+	chmod -x $@
+	$(TOOLCHAIN_PREFIX)objdump --disassemble-all $@ > $(BUILD_DIR)/$*.txt
+	$(TOOLCHAIN_PREFIX)size $@ > $(BUILD_DIR)/$*.size
+
+.PRECIOUS: $(BUILD_DIR)/%.elf $(BUILD_DIR)/%.bin
+
+$(BUILD_DIR)/start.o: $(START) $(BUILD_DIR)
+	$(TOOLCHAIN_PREFIX)gcc -c -mabi=ilp32 -march=$(ARCH) -o $@ $<
+
+$(BUILD_DIR):
+	mkdir -p $(BUILD_DIR)
+
+clean:
+	rm -vrf build
+
+.PHONY: all clean
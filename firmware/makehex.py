@@ -6,11 +6,20 @@
 # distribute this software, either in source code form or as a compiled
 # binary, for any purpose, commercial or non-commercial, and by any
 # means.
+#
+# Usage: makehex.py <firmware.bin> <nwords> [--dense]
+#
+# By default only non-zero regions are written, each starting with an
+# @<byte address> line; gaps of MIN_GAP zero words or more are skipped.
+# --dense writes every word and pads the image to nwords.
 
 from sys import argv
 
+MIN_GAP = 4
+
 binfile = argv[1]
 nwords = int(argv[2])
+dense = "--dense" in argv[3:]
 
 with open(binfile, "rb") as f:
     bindata = f.read()
@@ -18,10 +27,27 @@ with open(binfile, "rb") as f:
 assert len(bindata) < 4*nwords
 assert len(bindata) % 4 == 0
 
-for i in range(nwords):
-    if i < len(bindata) // 4:
-        w = bindata[4*i : 4*i+4]
-        print("%02x %02x %02x %02x" % (w[0], w[1], w[2], w[3]))
-    else:
-        print("00 00 00 00")
+words = [bindata[4*i : 4*i+4] for i in range(len(bindata) // 4)]
+
+if dense:
+    for i in range(nwords):
+        if i < len(words):
+            w = words[i]
+            print("%02x %02x %02x %02x" % (w[0], w[1], w[2], w[3]))
+        else:
+            print("00 00 00 00")
+else:
+    # [start, end) word ranges of non-zero data, merging short zero gaps
+    segments = []
+    for i, w in enumerate(words):
+        if not any(w):
+            continue
+        if segments and i - segments[-1][1] < MIN_GAP:
+            segments[-1][1] = i + 1
+        else:
+            segments.append([i, i + 1])
 
+    for start, end in segments:
+        print("@%08x" % (4*start))
+        for w in words[start:end]:
+            print("%02x %02x %02x %02x" % (w[0], w[1], w[2], w[3]))
@@ -13,3 +13,9 @@
 #define GPI         (*(ADR_CSR))
 #define GPO         (*(ADR_CSR+1UL))
 #define GPEN        (*(ADR_CSR+2UL))
+
+// Simulation handshake: GPO[2:0] carries the result code,
+// GPO[3] marks it as valid (see wait_done in cocotb/hachure_defaults.py)
+#define SIM_DONE_FLAG   0x8UL
+#define SIM_START()     do { GPEN = 0xFF; GPO = 0; } while (0)
+#define SIM_DONE(code)  do { GPO = (code); GPO = (code) | SIM_DONE_FLAG; } while (0)
@@ -0,0 +1,145 @@
+
+#include "../types.h"
+#include "../soc.h"
+
+#define CSR_GUARD_OFFSET  12
+
+// Data placements, must not overlap data, stack or the .fast copies
+#define RAM_DATA    (ADR_RAM + 0x600UL)
+#define SRAM_DATA   (ADR_SRAM + 0x8000UL)
+
+#define COPY_WORDS  64
+#define CRC_BYTES   32
+#define MAT_N       4   // 3 matrices must fit into 2 * COPY_WORDS
+
+// The kernels run from the region selected by the linker script variant
+// (see bench.ld). They only call each other, so nothing is fetched from
+// another region while they run: no libgcc, the multiply is done in .fast.
+#define FAST __attribute__((section(".fast"), noinline))
+
+extern uint32_t __fast_start, __fast_end, __fast_rom_start;
+// Absolute symbol (0 or 1), weak so that its address is not assumed non-null
+extern uint32_t __fast_copy __attribute__((weak));
+
+FAST uint32_t fast_mul(uint32_t a, uint32_t b)
+{
+  uint32_t r = 0;
+  while (b)
+  {
+    if (b & 1)
+      r += a;
+    a <<= 1;
+    b >>= 1;
+  }
+  return r;
+}
+
+FAST uint32_t bench_memcpy(volatile uint32_t *data)
+{
+  volatile uint32_t *src = data;
+  volatile uint32_t *dst = data + COPY_WORDS;
+  for (uint32_t i = 0; i < COPY_WORDS; ++i)
+    dst[i] = src[i];
+  return dst[COPY_WORDS - 1];
+}
+
+FAST uint32_t bench_crc(volatile uint32_t *data)
+{
+  volatile uint8_t *bytes = (volatile uint8_t *)data;
+  uint32_t crc = 0xFFFFFFFFUL;
+  for (uint32_t i = 0; i < CRC_BYTES; ++i)
+  {
+    crc ^= bytes[i];
+    for (uint32_t k = 0; k < 8; ++k)
+      crc = (crc >> 1) ^ (0xEDB88320UL & (0UL - (crc & 1)));
+  }
+  return ~crc;
+}
+
+FAST uint32_t bench_matmul(volatile uint32_t *data)
+{
+  volatile uint32_t *a = data;
+  volatile uint32_t *c = data + 2 * MAT_N * MAT_N;
+  uint32_t sum = 0;
+  // Rows and columns are stepped through, indices would need a multiply
+  for (uint32_t i = 0; i < MAT_N; ++i, a += MAT_N)
+  {
+    for (uint32_t j = 0; j < MAT_N; ++j)
+    {
+      volatile uint32_t *b = data + MAT_N * MAT_N + j;
+      uint32_t acc = 0;
+      for (uint32_t k = 0; k < MAT_N; ++k, b += MAT_N)
+        acc += fast_mul(a[k] & 0xF, *b & 0xF);
+      *c++ = acc;
+      sum += acc;
+    }
+  }
+  return sum;
+}
+
+typedef uint32_t (*kernel_fn)(volatile uint32_t *);
+
+void fill(volatile uint32_t *data, uint32_t words)
+{
+  uint32_t x = 0x2545F491UL;
+  for (uint32_t i = 0; i < words; ++i)
+  {
+    x ^= x << 13;
+    x ^= x >> 17;
+    x ^= x << 5;
+    data[i] = x;
+  }
+}
+
+void main(void)
+{
+  // Set GPIO to ouput
+  SIM_START();
+
+  // Required to fetch from XIP
+  *(ADR_CSR + CSR_GUARD_OFFSET) = 0x01;
+
+  // Copy the kernels to the RAM variants
+  if ((uint32_t)&__fast_copy)
+  {
+    uint32_t *src = &__fast_rom_start;
+    for (uint32_t *dst = &__fast_start; dst < &__fast_end; ++dst, ++src)
+      *dst = *src;
+  }
+
+  // Must match KERNELS and DATA in cocotb/test_bench_mem.py
+  kernel_fn kernels[] = {&bench_memcpy, &bench_crc, &bench_matmul};
+  volatile uint32_t *placements[] = {RAM_DATA, SRAM_DATA};
+  unsigned int n_kernels = sizeof(kernels) / sizeof(kernels[0]);
+  unsigned int n_placements = sizeof(placements) / sizeof(placements[0]);
+  uint32_t expected[3];
+  uint8_t result = 1;
+  uint32_t run = 0;
+
+  for (unsigned int p = 0; p < n_placements; ++p)
+    fill(placements[p], 2 * COPY_WORDS);
+
+  for (unsigned int p = 0; p < n_placements; ++p)
+  {
+    for (unsigned int k = 0; k < n_kernels; ++k)
+    {
+      // GPO marks the run for the testbench, 0 in between
+      GPO = ++run;
+      uint32_t r = kernels[k](placements[p]);
+      GPO = 0;
+      if (p == 0)
+        expected[k] = r;
+      else if (r != expected[k])
+        result = 2;
+    }
+  }
+
+  SIM_DONE(result);
+
+  while(1);
+
+  // excpeted at GPO:
+  // GPO[3] ... SIM_DONE_FLAG
+  // GPO[2:0] ... 1 (same results for all data placements), 2 (mismatch)
+  // Cycles per kernel are measured by the testbench
+}
@@ -0,0 +1,92 @@
+
+#include "../types.h"
+#include "../soc.h"
+
+#define CSR_GUARD_OFFSET  12
+
+// Copies of the benchmark, must not overlap data, stack or test buffers
+#define SRAM_CODE   (ADR_SRAM + 0x400UL)
+#define RAM_CODE    (ADR_RAM + 0x800UL)
+
+#define ITERATIONS  4
+
+typedef uint32_t (*bench_fn)(uint32_t);
+
+// Own section, the linker provides __start_/__stop_bench_text for copying
+#define BENCH __attribute__((section("bench_text"), noinline))
+
+extern uint32_t __start_bench_text[], __stop_bench_text[];
+
+// Dhrystone-like mix of ALU, load/store and branches. Must stay a leaf
+// without libgcc calls (no mul/div) so that copies run anywhere.
+BENCH uint32_t bench(uint32_t iterations)
+{
+  uint32_t buf[16];
+  uint32_t acc = 0x12345678UL;
+
+  for (uint32_t i = 0; i < iterations; ++i)
+  {
+    for (uint32_t j = 0; j < 16; ++j)
+      buf[j] = acc ^ (j << 3);
+
+    for (uint32_t j = 0; j < 16; ++j)
+    {
+      uint32_t v = buf[(j + (j << 2)) & 15];
+      if (v & 1)
+        acc = (acc << 1) ^ v;
+      else
+        acc = (acc >> 3) + v;
+    }
+  }
+  return acc;
+}
+
+bench_fn copy_bench(volatile uint32_t *dst)
+{
+  bench_fn fn = (bench_fn)(uint32_t)dst;
+
+  for (const uint32_t *src = __start_bench_text; src < __stop_bench_text; ++src)
+    *dst++ = *src;
+  return fn;
+}
+
+void main(void)
+{
+  // Set GPIO to ouput
+  SIM_START();
+
+  // Required to fetch from XIP
+  *(ADR_CSR + CSR_GUARD_OFFSET) = 0x01;
+
+  // Must match REGIONS in cocotb/test_cpi.py
+  bench_fn regions[] = {
+    &bench,                                                        // flash via QSPI
+    (bench_fn)((uint32_t)ADR_EF_XIP + (uint32_t)&bench),           // flash via XIP
+    copy_bench(SRAM_CODE),                                         // QSPI RAM
+    copy_bench(RAM_CODE),                                          // on-chip RAM
+  };
+  unsigned int n_regions = sizeof(regions) / sizeof(regions[0]);
+  uint32_t expected = 0;
+  uint8_t result = 1;
+
+  for (unsigned int r = 0; r < n_regions; ++r)
+  {
+    // GPO marks the region under test for the testbench, 0 in between
+    GPO = r + 1;
+    uint32_t acc = regions[r](ITERATIONS);
+    GPO = 0;
+    if (r == 0)
+      expected = acc;
+    else if (acc != expected)
+      result = 2;
+  }
+
+  SIM_DONE(result);
+
+  while(1);
+
+  // excpeted at GPO:
+  // GPO[3] ... SIM_DONE_FLAG
+  // GPO[2:0] ... 1 (all regions computed the same result), 2 (mismatch)
+  // Cycles and fetches per region are measured by the testbench
+}
@@ -1,8 +1,6 @@
 
 #include "../soc.h"
 
-#define CSR_GPOE_OFFSET   2
-
 #define EF_RXDATA_OFFSET  0
 #define EF_TXDATA_OFFSET  1
 #define EF_CFG_OFFSET     2
@@ -14,8 +12,7 @@
 void main(void)
 {
   // Set GPIO to ouput
-  *(ADR_CSR + CSR_GPOE_OFFSET) = 0xFF;
-  GPO = 0;
+  SIM_START();
 
   // Enable clock
   *(ADR_EF_SPI + EF_GCLK_OFFSET) = 0x1UL;
@@ -49,9 +46,9 @@ void main(void)
     }
 
     if ((*(ADR_EF_SPI + EF_RXDATA_OFFSET)&0xFFUL) == 0x1D)
-      GPO = 1;
+      SIM_DONE(1);
     else
-      GPO = 2;
+      SIM_DONE(2);
 
 
     while(1);
@@ -0,0 +1,80 @@
+
+#include "../types.h"
+#include "../soc.h"
+
+#define CSR_OLED_START_OFFSET 8
+#define CSR_OLED_CONF_OFFSET  9
+#define CSR_OLED_DMA_OFFSET   10
+
+// Must match cocotb/test_oled.py
+#define FRAME_BYTES   64
+#define FRAME_WORDS   (FRAME_BYTES / 4)
+#define RAM_FRAME     (ADR_RAM + 0x800UL)
+#define SRAM_FRAME    (ADR_SRAM)
+
+unsigned long pattern(unsigned long addr, unsigned long seed)
+{
+  unsigned long x = addr + seed;
+  x ^= (x >> 13);
+  x += (x << 7);
+  x ^= (x >> 17);
+  x += (x << 5);
+  return x;
+}
+
+uint32_t oled_transfer(volatile uint32_t *frame, uint32_t presc)
+{
+  uint32_t sum = 0;
+  unsigned int i = 0;
+
+  *(ADR_CSR + CSR_OLED_DMA_OFFSET) = (uint32_t)frame;
+  *(ADR_CSR + CSR_OLED_CONF_OFFSET) =
+    (presc << 0) |       // prescaler
+    (1UL << 4) |         // increment address
+    (FRAME_BYTES << 8);  // size in bytes
+
+  // The start bit is held, clear it once the DMA left idle
+  *(ADR_CSR + CSR_OLED_START_OFFSET) = 1;
+  *(ADR_CSR + CSR_OLED_START_OFFSET) = 0;
+
+  // Keep the CPU reading the same memory to contend with the DMA
+  while (!(*(ADR_CSR + CSR_OLED_START_OFFSET) & 1))
+  {
+    sum += frame[i];
+    i = (i + 1) % FRAME_WORDS;
+  }
+  return sum;
+}
+
+void main(void)
+{
+  // Set GPIO to ouput
+  SIM_START();
+
+  // Must match TRANSFERS in cocotb/test_oled.py
+  volatile uint32_t *frames[] = {SRAM_FRAME, RAM_FRAME};
+  uint32_t prescs[] = {1, 2, 4};
+  unsigned int n_frames = sizeof(frames) / sizeof(frames[0]);
+  unsigned int n_prescs = sizeof(prescs) / sizeof(prescs[0]);
+
+  for (unsigned int f = 0; f < n_frames; ++f)
+  {
+    for (unsigned int i = 0; i < FRAME_WORDS; ++i)
+      frames[f][i] = pattern((unsigned long)i, (unsigned long)(42UL + f));
+  }
+
+  for (unsigned int f = 0; f < n_frames; ++f)
+  {
+    for (unsigned int p = 0; p < n_prescs; ++p)
+      oled_transfer(frames[f], prescs[p]);
+  }
+
+  SIM_DONE(1);
+
+  while(1);
+
+  // excpeted at GPO:
+  // GPO[3] ... SIM_DONE_FLAG
+  // GPO[0] ... 1 (all transfers done)
+  // The frames are checked by the testbench
+}
@@ -3,13 +3,11 @@
 
 #define CSR_SPI_CONF_OFFSET 7
 #define CSR_SPI_STAT_OFFSET 11
-#define CSR_GPOE_OFFSET 2
 
 void main(void)
 {
   // Set GPIO to ouput
-  *(ADR_CSR + CSR_GPOE_OFFSET) = 0xFF;
-  GPO = 0;
+  SIM_START();
 
   // Setup uSPI
   *(ADR_CSR + CSR_SPI_CONF_OFFSET) =
@@ -30,9 +28,9 @@ void main(void)
     }
 
     if ((*(ADR_SPI)&0xFFUL) == 0x1D)
-      GPO = 1;
+      SIM_DONE(1);
     else
-      GPO = 2;
+      SIM_DONE(2);
 
     while(1);
   }
@@ -5,8 +5,6 @@
 #define ADR_SRAM ((volatile uint32_t*)(0x10000000))
 #define ADR_RAM  ((volatile uint32_t*)(0x20000000))
 
-#define CSR_GPOE_OFFSET 2
-
 unsigned long pattern(unsigned long addr, unsigned long seed)
 {
   unsigned long x = addr + seed;
@@ -20,7 +18,7 @@ unsigned long pattern(unsigned long addr, unsigned long seed)
 void main(void)
 {
   // Set GPIO to ouput
-  *(ADR_CSR + CSR_GPOE_OFFSET) = 0xFF;
+  SIM_START();
 
   // Ensure this does not conflict with the stack!
   // Word offsets
@@ -93,13 +91,12 @@ void main(void)
 
   // Write GPO
   GPO = 3;
-  GPO = 7;
-  GPO = 15;
-  GPO = result;
+  SIM_DONE(result);
 
   while(1);
 
   // excpeted at GPO:
+  // GPO[3] ... SIM_DONE_FLAG
   // GPO[0] ... 0 (stuck), 1 (done)
   // GPO[1] ... 0 (ADR_SRAM error), 1 (ADR_SRAM ok)
   // GPO[2] ... 0 (ADR_RAM error), 1 (ADR_RAM ok)
@@ -16,6 +16,8 @@
 
 void main(void)
 {
+  SIM_START();
+
   EF_UART_setGclkEnable(UART0_BASE, 1);
   EF_UART_enable(UART0_BASE);
   EF_UART_enableRx(UART0_BASE);
@@ -30,6 +32,9 @@ void main(void)
   // baudrate = clock_f / ((PR+1)*8)
   EF_UART_setPrescaler(UART0_BASE, F_CPU/(BAUDRATE*8)-1);
 
+  // Ready to echo
+  SIM_DONE(1);
+
   while(1)
   {
     EF_UART_writeChar(UART0_BASE, EF_UART_readChar(UART0_BASE));
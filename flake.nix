@@ -73,6 +73,7 @@
           
           # For logo generation
           pillow
+          numpy
         ];
       }) {};
     });
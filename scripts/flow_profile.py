@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Per-step profile of LibreLane runs: wall time from the runtime.txt of
+# each step, CPU time and peak RSS of its tools from the *.process_stats.json
+# LibreLane writes for every tool it runs. Results go to profile.json and a
+# folded stack file (flamegraph.pl, speedscope) in the run directory, and a
+# summary is printed. Works for finished runs as well as for flows started
+# from Python or the librelane command line.
+
+import os
+import re
+import sys
+import json
+import subprocess
+
+# Units of LibreLane's format_size, plain numbers are bytes
+UNITS = {"": 1, "b": 1, "kib": 2**10, "mib": 2**20, "gib": 2**30, "tib": 2**40, "pib": 2**50, "eib": 2**60}
+
+
+def parse_runtime(text):
+    """Seconds of a runtime.txt (HH:MM:SS.mmm)"""
+    seconds = 0.0
+    for part in text.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_time(value):
+    """Seconds of a process_stats.json time (HH:MM:SS.mmm), None if missing"""
+    try:
+        return parse_runtime(value) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_size(value):
+    """Bytes of a process_stats.json size (e.g. 1536MiB), None if missing"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r"\s*([\d.]+)\s*([a-zA-Z]*)\s*", str(value))
+    if not match or match.group(2).lower() not in UNITS:
+        return None
+    return float(match.group(1)) * UNITS[match.group(2).lower()]
+
+
+def tool_stats(stats_file):
+    """Runtime, CPU time and peak RSS of one tool run"""
+    with open(stats_file) as f:
+        stats = json.load(f)
+    times = stats.get("time", {})
+    peak = stats.get("peak_resources", {})
+    cpu = [parse_time(times.get(key)) for key in ("cpu_time_user", "cpu_time_system")]
+    rss = parse_size(peak.get("memory_rss"))
+    return {
+        "tool": os.path.basename(stats_file)[: -len(".process_stats.json")],
+        "wall_s": parse_time(times.get("runtime")),
+        "cpu_s": sum(c for c in cpu if c is not None),
+        "peak_rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+    }
+
+
+def read_runtime(path):
+    with open(path) as f:
+        return parse_runtime(f.read())
+
+
+def step_profile(step_dir):
+    name = os.path.basename(step_dir)
+    runtime = os.path.join(step_dir, "runtime.txt")
+    tools = [tool_stats(os.path.join(root, f))
+             for root, _, files in os.walk(step_dir) for f in sorted(files) if f.endswith(".process_stats.json")]
+    rss = [t["peak_rss_mb"] for t in tools if t["peak_rss_mb"] is not None]
+    return {
+        "step": name.split("-", 1)[1] if "-" in name else name,
+        "dir": name,
+        "status": "ok" if os.path.exists(os.path.join(step_dir, "state_out.json")) else "failed",
+        "wall_s": round(read_runtime(runtime), 3) if os.path.exists(runtime) else 0.0,
+        "cpu_s": round(sum(t["cpu_s"] for t in tools), 3),
+        "peak_rss_mb": max(rss, default=None),
+        "tools": tools,
+    }
+
+
+def run_profile(run_dir):
+    """Profiles of the steps of a run, in execution order"""
+    dirs = [d for d in os.listdir(run_dir) if re.match(r"\d+-", d) and os.path.isdir(os.path.join(run_dir, d))]
+    return [step_profile(os.path.join(run_dir, d)) for d in sorted(dirs, key=lambda d: int(d.split("-")[0]))]
+
+
+def totals(steps):
+    return {
+        "wall_s": round(sum(s["wall_s"] for s in steps), 3),
+        "cpu_s": round(sum(s["cpu_s"] for s in steps), 3),
+        "peak_rss_mb": max((s["peak_rss_mb"] or 0 for s in steps), default=0),
+    }
+
+
+def save(run_dir, flow_name, steps):
+    profile = {"flow": flow_name, "run": os.path.abspath(run_dir), "steps": steps, "total": totals(steps)}
+    with open(os.path.join(run_dir, "profile.json"), "w") as f:
+        json.dump(profile, f, indent=2)
+    # Folded stacks weighted by milliseconds, tools nested in their step
+    with open(os.path.join(run_dir, "profile.folded"), "w") as f:
+        for s in steps:
+            rest = s["wall_s"]
+            for t in s["tools"]:
+                if t["wall_s"]:
+                    f.write(f"{flow_name};{s['step']};{t['tool']} {int(t['wall_s'] * 1000)}\n")
+                    rest -= t["wall_s"]
+            f.write(f"{flow_name};{s['step']} {int(max(rest, 0) * 1000)}\n")
+    return os.path.join(run_dir, "profile.json")
+
+
+def summary(steps, top=None):
+    total = totals(steps)
+    print(f"{'step':40s} {'wall [s]':>9s} {'cpu [s]':>9s} {'rss [MB]':>9s}  share")
+    for s in sorted(steps, key=lambda s: s["wall_s"], reverse=True)[:top]:
+        share = s["wall_s"] / total["wall_s"] if total["wall_s"] else 0
+        rss = f"{s['peak_rss_mb']:.0f}" if s["peak_rss_mb"] is not None else "-"
+        mark = "" if s["status"] == "ok" else f" ({s['status']})"
+        print(f"{s['step'] + mark:40s} {s['wall_s']:9.1f} {s['cpu_s']:9.1f} {rss:>9s}  "
+              f"{'#' * round(share * 40):40s} {share * 100:5.1f}%")
+    print(f"{'total':40s} {total['wall_s']:9.1f} {total['cpu_s']:9.1f} {total['peak_rss_mb']:9.0f}")
+
+
+def profile(run_dir, flow_name):
+    """Write and print the profile of a run"""
+    steps = run_profile(run_dir)
+    path = save(run_dir, flow_name, steps)
+    summary(steps)
+    print(f"Profile written to {path}")
+
+
+def run_profiled(flow, flow_name, **kwargs):
+    """Start a flow, profile its run even if it fails"""
+    try:
+        return flow.start(**kwargs)
+    finally:
+        run_dir = getattr(flow, "run_dir", None)
+        if run_dir and os.path.isdir(run_dir):
+            profile(run_dir, flow_name)
+
+
+def last_run_dir(config_paths):
+    """Newest run next to the given configs"""
+    runs = [os.path.join(d, "runs", r) for d in {os.path.dirname(os.path.abspath(c)) for c in config_paths}
+            if os.path.isdir(os.path.join(d, "runs")) for r in os.listdir(os.path.join(d, "runs"))]
+    return max(runs, key=os.path.getmtime, default=None)
+
+
+def main(argv):
+    # Profile of a finished run
+    if len(argv) == 1 and os.path.isdir(argv[0]):
+        profile(argv[0], "librelane")
+        return 0
+
+    # Run the librelane command line, then profile its run
+    configs = [arg for arg in argv if arg.endswith((".yaml", ".yml", ".json")) and os.path.isfile(arg)]
+    returncode = subprocess.run(["librelane", *argv]).returncode
+    run_dir = last_run_dir(configs)
+    if run_dir:
+        profile(run_dir, "librelane")
+    return returncode
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print("usage: flow_profile.py <run directory>")
+        print("       flow_profile.py <librelane arguments>")
+        print("Profiles the steps of a finished run, or runs librelane and profiles the new run.")
+        sys.exit(0)
+
+    sys.exit(main(sys.argv[1:]))
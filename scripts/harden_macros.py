@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Hardens the FazyRV macros on a bounded pool of worker processes.
+# A macro is skipped if the hash of its inputs matches the one recorded
+# with its final/ views, otherwise the netlist is brought up to date, the Classic
+# flow is run and exactly that run is promoted to final/.
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import macro_nl
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MACROS_DIR = ROOT_DIR / "macros"
+
+MACROS = ["frv_1", "frv_2", "frv_4", "frv_8", "frv_4ccx", "frv_1bram", "frv_8bram"]
+
+# Recorded next to the promoted views
+STAMP = "inputs.json"
+
+# Rough peak memory of one macro flow
+MEM_PER_JOB_GB = 4
+
+
+def input_files(macro_dir):
+    """Wrapper, netlist, synthesis script and flow configuration of a macro"""
+    files = sorted(macro_dir.glob("frv_*.sv"))
+    files += [macro_dir / name for name in ("prep.ys", "config.yaml", "pin_order.cfg")]
+    return [f for f in files if f.exists()]
+
+
+def inputs_hash(macro_dir, extra=""):
+    digest = hashlib.sha256(extra.encode())
+    for f in input_files(macro_dir):
+        digest.update(f.name.encode())
+        digest.update(f.read_bytes())
+    return digest.hexdigest()
+
+
+def read_stamp(macro_dir):
+    try:
+        return json.loads((macro_dir / "final" / STAMP).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def available_memory():
+    """Available memory in bytes, total memory if unknown"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def default_jobs(n_macros, mem_per_job_gb):
+    by_mem = int(available_memory() / (mem_per_job_gb * 1024**3))
+    return max(1, min(os.cpu_count() or 1, by_mem, n_macros))
+
+
+def promote(run_dir, macro_dir, stamp):
+    """Replace final/ by the views of the given run"""
+    final = macro_dir / "final"
+    if final.exists():
+        shutil.rmtree(final)
+    shutil.copytree(run_dir / "final", final)
+    (final / STAMP).write_text(json.dumps(stamp, indent=2) + "\n")
+
+
+def harden(macro, pdk_root, pdk, skip_steps, force):
+    """Worker: netlist, flow and promotion of one macro"""
+    macro_dir = MACROS_DIR / macro
+    tag = time.strftime("RUN_%Y-%m-%d_%H-%M-%S")
+    run_dir = macro_dir / "runs" / tag
+    start = time.monotonic()
+
+    def result(status, message=""):
+        return {"macro": macro, "status": status, "tag": tag,
+                "duration": time.monotonic() - start, "message": message}
+
+    run_dir.mkdir(parents=True, exist_ok=True)
+    log_file = run_dir / "harden.log"
+
+    try:
+        with open(log_file, "w") as log:
+            macro_nl.build(macro, log)
+    except subprocess.CalledProcessError:
+        return result("FAIL", f"yosys failed, see {log_file}")
+
+    digest = inputs_hash(macro_dir, extra=" ".join([pdk, *skip_steps]))
+    if not force and read_stamp(macro_dir).get("hash") == digest:
+        shutil.rmtree(run_dir)
+        return result("SKIP", "inputs unchanged")
+
+    # The flow logs to the console, keep the workers apart
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with open(log_file, "a") as log:
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+
+    from librelane.flows import Flow
+    from librelane.flows.flow import FlowError
+
+    Classic = Flow.factory.get("Classic")
+    flow = Classic(
+        str(macro_dir / "config.yaml"),
+        design_dir=str(macro_dir),
+        pdk_root=pdk_root,
+        pdk=pdk,
+    )
+
+    try:
+        flow.start(tag=tag, skip=skip_steps)
+    except FlowError as e:
+        return result("FAIL", f"{e}".splitlines()[0] if f"{e}" else "flow failed")
+
+    promote(run_dir, macro_dir, {"hash": digest, "tag": tag, "pdk": pdk, "skip": skip_steps})
+    return result("PASS", f"promoted to {macro_dir.relative_to(ROOT_DIR) / 'final'}")
+
+
+def main(macros, jobs, pdk_root, pdk, skip_steps, force):
+    for macro in macros:
+        if not (MACROS_DIR / macro / "config.yaml").exists():
+            print(f"Error: unknown macro {macro}")
+            return 1
+
+    print(f"Hardening {len(macros)} macros on {jobs} workers")
+
+    results = []
+    # A fresh process per macro, the workers redirect their output
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as pool:
+        running = {pool.submit(harden, macro, pdk_root, pdk, skip_steps, force): macro for macro in macros}
+        for future in as_completed(running):
+            try:
+                res = future.result()
+            except Exception as e:
+                res = {"macro": running[future], "status": "FAIL", "tag": "", "duration": 0.0, "message": repr(e)}
+            results.append(res)
+            print(f"[{res['status']}] {res['macro']:10s} {res['duration']:8.1f} s  {res['tag']}  {res['message']}")
+
+    n_failed = sum(res["status"] == "FAIL" for res in results)
+    n_skipped = sum(res["status"] == "SKIP" for res in results)
+    print(f"{len(results) - n_failed - n_skipped} hardened, {n_skipped} unchanged, {n_failed} failed")
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        prog="harden_macros", description="Harden the FazyRV macros in parallel"
+    )
+    parser.add_argument(
+        "macros", nargs="*", default=MACROS, help="macros to harden"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="number of parallel flows (default: by cores and memory)"
+    )
+    parser.add_argument(
+        "--mem-per-job", type=float, default=MEM_PER_JOB_GB, help="expected peak memory of one flow in GB"
+    )
+    parser.add_argument(
+        "--nodrc", action="store_true", help="skip the KLayout and Magic DRC"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="harden even if the inputs are unchanged"
+    )
+
+    args = parser.parse_args()
+
+    pdk_root = os.getenv("PDK_ROOT", os.path.expanduser("~/.ciel"))
+    pdk = os.getenv("PDK", "gf180mcuD")
+    skip_steps = ["KLayout.DRC", "Magic.DRC"] if args.nodrc else []
+    jobs = args.jobs or default_jobs(len(args.macros), args.mem_per_job)
+
+    sys.exit(main(args.macros, jobs, pdk_root, pdk, skip_steps, args.force))
@@ -1,17 +1,42 @@
 # SPDX-FileCopyrightText: © 2025 Leo Moser <leo.moser@pm.me>
 # SPDX-License-Identifier: Apache-2.0
 
+import io
 import os
 import argparse
 import klayout.lay as lay
 import klayout.db as db
+from PIL import Image, ImageChops
 
+# Background of the single render, replaced by the requested backgrounds.
+# Must not appear in the layer colors of the layer properties.
+KEY_COLOR = "#FE01FD"
 
-def main(input_layout, output_image, width, height, oversampling, pdk_root, pdk):
+
+def blends_background(lv):
+    """Whether a visible layer is drawn transparently, i.e. mixed with the background"""
+    return any(lyp.visible and lyp.transparent for lyp in lv.each_layer())
+
+
+def composite(raster, backgrounds, size):
+    """Replace the key background by each background and downsample"""
+    raster = raster.convert("RGB")
+    key = Image.new("RGB", raster.size, KEY_COLOR)
+    mask = ImageChops.difference(raster, key).convert("L").point(lambda v: 255 if v == 0 else 0)
+
+    images = {}
+    for name, color in backgrounds.items():
+        image = Image.composite(Image.new("RGB", raster.size, color), raster, mask)
+        images[name] = image.resize(size, Image.BOX)
+    return images
+
+
+def main(input_layout, output_image, width, height, oversampling, pdk_root, pdk,
+         backgrounds=None, thumbnails=(), render_per_background=False):
 
     # Background colors
-    background_white = "#FFFFFF"
-    background_black = "#000000"
+    if not backgrounds:
+        backgrounds = {"white": "#FFFFFF", "black": "#000000"}
 
     lv = lay.LayoutView()
 
@@ -69,21 +94,40 @@ def main(input_layout, output_image, width, height, oversampling, pdk_root, pdk)
     base_name = os.path.splitext(os.path.basename(output_image))[0]
     directory = os.path.dirname(output_image)
 
-    lv.set_config("background-color", background_white)
-    lv.save_image_with_options(
-        os.path.join(directory, base_name + "_white.png"),
-        width,
-        height,
-        oversampling=oversampling,
+    if not render_per_background and blends_background(lv):
+        # Transparent layers mix with the key color and no longer match it
+        print("Transparent layers in the layer properties, rendering once per background")
+        render_per_background = True
+
+    if render_per_background:
+        # One full render per background, exact for transparent layers
+        for name, color in backgrounds.items():
+            lv.set_config("background-color", color)
+            lv.save_image_with_options(
+                os.path.join(directory, f"{base_name}_{name}.png"),
+                width,
+                height,
+                oversampling=oversampling,
+            )
+        return
+
+    # Render once at the oversampled size on the key background,
+    # all backgrounds and sizes are derived from this raster.
+    # Lines and stipples are scaled like the oversampling of save_image_with_options.
+    lv.set_config("background-color", KEY_COLOR)
+    pixels = lv.get_pixels_with_options(
+        width * oversampling,
+        height * oversampling,
+        linewidth=oversampling,
+        resolution=1 / oversampling,
     )
+    raster = Image.open(io.BytesIO(pixels.to_png_data()))
 
-    lv.set_config("background-color", background_black)
-    lv.save_image_with_options(
-        os.path.join(directory, base_name + "_black.png"),
-        width,
-        height,
-        oversampling=oversampling,
-    )
+    for name, image in composite(raster, backgrounds, (width, height)).items():
+        image.save(os.path.join(directory, f"{base_name}_{name}.png"))
+        for thumb_width in thumbnails:
+            thumb = image.resize((thumb_width, int(thumb_width / aspect_ratio)), Image.LANCZOS)
+            thumb.save(os.path.join(directory, f"{base_name}_{name}_{thumb_width}.png"))
 
 
 if __name__ == "__main__":
@@ -101,6 +145,20 @@ if __name__ == "__main__":
     parser.add_argument(
         "--oversampling", type=int, default=1, help="oversampling factor"
     )
+    parser.add_argument(
+        "--backgrounds",
+        nargs="*",
+        default=["white=#FFFFFF", "black=#000000"],
+        help="output suffix and background color pairs e.g. white=#FFFFFF",
+    )
+    parser.add_argument(
+        "--thumbnails", nargs="*", type=int, default=[], help="additional image widths"
+    )
+    parser.add_argument(
+        "--render-per-background",
+        action="store_true",
+        help="render the layout once per background instead of compositing",
+    )
 
     args = parser.parse_args()
 
@@ -112,4 +170,7 @@ if __name__ == "__main__":
         args.oversampling,
         pdk_root,
         pdk,
+        backgrounds=dict(bg.split("=", 1) for bg in args.backgrounds),
+        thumbnails=args.thumbnails,
+        render_per_background=args.render_per_background,
     )
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Netlist cache for the FazyRV macros. The netlist of a macro is keyed on
+# the Yosys version, its prep.ys and every file the script reads (including
+# `include files). Stale variants are synthesized in parallel, the others are
+# restored from macros/nl_cache/ without running Yosys.
+
+import os
+import re
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MACROS_DIR = ROOT_DIR / "macros"
+CACHE_DIR = MACROS_DIR / "nl_cache"
+
+MACROS = ["frv_1", "frv_2", "frv_4", "frv_8", "frv_4ccx", "frv_1bram", "frv_8bram"]
+
+# Cached netlists kept per macro
+KEEP = 4
+
+READ_RE = re.compile(r"^\s*read_verilog\b(.*)$", re.MULTILINE)
+WRITE_RE = re.compile(r"^\s*write_verilog\b.*\s(\S+)\s*$", re.MULTILINE)
+INCLUDE_RE = re.compile(r'^\s*`include\s+"([^"]+)"', re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def yosys_version():
+    try:
+        return subprocess.run(["yosys", "-V"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def script_files(macro_dir):
+    """Sources read and netlist written by the prep.ys of a macro"""
+    script = (macro_dir / "prep.ys").read_text()
+    sources = []
+    for args in READ_RE.findall(script):
+        sources += [macro_dir / arg for arg in args.split() if not arg.startswith("-")]
+    netlist = WRITE_RE.findall(script)
+    return sources, macro_dir / (netlist[-1] if netlist else f"{macro_dir.name}_nl.sv")
+
+
+def with_includes(sources):
+    """Sources and the files they `include, relative to the including file"""
+    seen = []
+    pending = list(sources)
+    while pending:
+        source = pending.pop(0).resolve()
+        if source in seen:
+            continue
+        seen.append(source)
+        if source.exists():
+            for name in INCLUDE_RE.findall(source.read_text(errors="replace")):
+                if (source.parent / name).exists():
+                    pending.append(source.parent / name)
+    return seen
+
+
+def fingerprint(macro_dir):
+    digest = hashlib.sha256(yosys_version().encode())
+    digest.update((macro_dir / "prep.ys").read_bytes())
+    sources, _ = script_files(macro_dir)
+    for source in with_includes(sources):
+        digest.update(os.path.relpath(source, ROOT_DIR).encode())
+        # A missing file is left for Yosys to report
+        digest.update(source.read_bytes() if source.exists() else b"missing")
+    return digest.hexdigest()
+
+
+def prune(macro):
+    entries = sorted(CACHE_DIR.glob(f"{macro}-*.sv"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for entry in entries[KEEP:]:
+        entry.unlink()
+
+
+def build(macro, log=None, force=False):
+    """
+    Bring the netlist of a macro up to date.
+    Returns "cached", "hit" or "built", raises CalledProcessError if Yosys fails.
+    """
+    macro_dir = MACROS_DIR / macro
+    _, netlist = script_files(macro_dir)
+    key = fingerprint(macro_dir)
+    cached = CACHE_DIR / f"{macro}-{key[:16]}.sv"
+
+    if cached.exists() and not force:
+        cached.touch()
+        if netlist.exists() and netlist.read_bytes() == cached.read_bytes():
+            return "cached"
+        shutil.copyfile(cached, netlist)
+        return "hit"
+
+    subprocess.run(["yosys", "-s", "prep.ys"], cwd=macro_dir, check=True,
+                   stdout=log or subprocess.DEVNULL, stderr=subprocess.STDOUT)
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    # Atomic, so concurrent builds never see a partial netlist
+    tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+    shutil.copyfile(netlist, tmp)
+    tmp.replace(cached)
+    prune(macro)
+    return "built"
+
+
+def run(macro, force):
+    start = time.monotonic()
+    log_file = MACROS_DIR / macro / "prep.log"
+    try:
+        with open(log_file, "w") as log:
+            status = build(macro, log, force)
+    except subprocess.CalledProcessError:
+        status = f"FAIL, see {log_file.relative_to(ROOT_DIR)}"
+    return macro, status, time.monotonic() - start
+
+
+def main(macros, jobs, force):
+    n_failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        running = [pool.submit(run, macro, force) for macro in macros]
+        for future in as_completed(running):
+            macro, status, duration = future.result()
+            n_failed += status.startswith("FAIL")
+            print(f"{macro:10s} {duration:6.1f} s  {status}")
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        prog="macro_nl", description="Generate the macro netlists, reusing cached ones"
+    )
+    parser.add_argument(
+        "macros", nargs="*", default=MACROS, help="macros to synthesize"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count(), help="number of parallel Yosys runs"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="rerun Yosys even on a cache hit"
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(main(args.macros, args.jobs, args.force))
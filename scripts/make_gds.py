@@ -0,0 +1,308 @@
+# SPDX-FileCopyrightText: © 2024 Leo Moser <leo.moser@pm.me>
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import yaml
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import klayout.db as db
+import numpy as np
+from PIL import Image
+
+DEFAULT_CACHE = Path(__file__).resolve().parent.parent / "ip" / ".make_gds_cache.json"
+
+
+def pixel_rectangles(pixels):
+    """Cover the set pixels with rectangles (x, y, w, h), y counted from the top"""
+    # Run starts/ends of every row from the edges of the zero-padded rows
+    padded = np.zeros((pixels.shape[0], pixels.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = pixels
+    edges = np.diff(padded, axis=1)
+
+    rectangles = []
+    growing = {}  # (x0, x1) -> first row of a run repeated in consecutive rows
+
+    for y, row in enumerate(edges):
+        runs = set(zip(np.flatnonzero(row == 1).tolist(), np.flatnonzero(row == -1).tolist()))
+
+        # Close the rectangles whose run does not continue in this row
+        for run in [run for run in growing if run not in runs]:
+            y0 = growing.pop(run)
+            rectangles.append((run[0], y0, run[1] - run[0], y - y0))
+
+        for run in runs:
+            growing.setdefault(run, y)
+
+    for (x0, x1), y0 in growing.items():
+        rectangles.append((x0, y0, x1 - x0, pixels.shape[0] - y0))
+
+    return rectangles
+
+
+def convert_to_gds(
+    input_filepath,
+    output_filepath,
+    cellname="TOP",
+    scale=1.0,
+    width=None,
+    height=None,
+    threshold=128,
+    invert=False,
+    invert_alpha=False,
+    merge=False,
+    smooth=False,
+    instances=False,
+    pixel_size=6,
+    foregrounds=["1/0"],
+    boundaries=["0/0"],
+):
+
+    ly = db.Layout()
+    ly.dbu = 0.001
+
+    top = ly.create_cell(cellname)
+    to_um = db.CplxTrans(ly.dbu)
+    from_um = to_um.inverted()
+
+    # Open the image
+    img = Image.open(input_filepath)
+
+    # Add the foregrounds
+    foreground_layers = []
+    for foreground in foregrounds:
+        layer, datatype = foreground.split('/')
+        foreground_layer = db.LayerInfo(int(layer), int(datatype))
+        foreground_layers.append(foreground_layer)
+
+    if not invert_alpha:
+        # Create a white rgba background
+        new_image = Image.new("RGBA", img.size, "WHITE")
+    else:
+        # Create a black rgba background
+        new_image = Image.new("RGBA", img.size, "BLACK")
+
+    # Paste the image on the background
+    new_image.paste(img, (0, 0), img)
+
+    # Convert the image to grayscale
+    new_image_grayscale = new_image.convert("L")
+
+    # new_image_grayscale.show()
+
+    # Convert the image to binary
+    new_image_binary = new_image_grayscale.point(lambda x: 255 if x > threshold else 0)
+    new_image_binary = new_image_binary.convert("1")
+
+    # new_image_binary.show()
+
+    # Scale down the image
+    if scale != 1.0:
+        new_image_binary.thumbnail(
+            (new_image_binary.width * scale, new_image_binary.height * scale),
+            Image.LANCZOS,
+        )
+
+    if width or height:
+        new_image_binary.thumbnail(
+            (width, height),
+            Image.LANCZOS,
+        )
+
+    # Pixels to draw, row 0 is the top of the image
+    pixels = (np.asarray(new_image_binary) != 0) != invert
+
+    # Runs of set pixels coalesced into rectangles
+    rectangles = pixel_rectangles(pixels)
+    boxes = [
+        db.DBox(
+            x * pixel_size,
+            (new_image_binary.height - y - h) * pixel_size,
+            (x + w) * pixel_size,
+            (new_image_binary.height - y) * pixel_size,
+        )
+        for x, y, w, h in rectangles
+    ]
+
+    if not merge and instances:
+        # One pixel cell, arrayed over every rectangle
+        pixel = ly.create_cell(f"{cellname}_pixel")
+        for foreground_layer in foreground_layers:
+            pixel.shapes(foreground_layer).insert(db.DBox(0.0, 0.0, pixel_size, pixel_size))
+
+        for box, (x, y, w, h) in zip(boxes, rectangles):
+            top.insert(db.DCellInstArray(
+                pixel.cell_index(),
+                db.DTrans(box.left, box.bottom),
+                db.DVector(pixel_size, 0.0),
+                db.DVector(0.0, pixel_size),
+                w,
+                h,
+            ))
+    elif not merge:
+        for foreground_layer in foreground_layers:
+            shapes = top.shapes(foreground_layer)
+            for box in boxes:
+                shapes.insert(box)
+    else:
+        # Use a region to merge pixels together
+        top_region = db.Region([db.Polygon(from_um * box) for box in boxes])
+        top_region.merge()
+
+        if smooth:
+            top_region = top_region.smoothed(from_um * pixel_size * 0.99)
+
+        for foreground_layer in foreground_layers:
+            top.shapes(foreground_layer).insert(top_region)
+
+    # Add the boundaries
+    for boundary in boundaries:
+        layer, datatype = boundary.split('/')
+        boundary_layer = db.LayerInfo(int(layer), int(datatype))
+        top.shapes(boundary_layer).insert(db.DBox.new(0, 0, new_image_binary.width * pixel_size, new_image_binary.height * pixel_size))
+
+    # Save the layout to a file
+    ly.write(output_filepath)
+
+
+
+def cache_key(params):
+    """Hash over the image, the conversion parameters and this script"""
+    h = hashlib.sha256()
+    h.update(Path(params["input_filepath"]).read_bytes())
+    h.update(Path(__file__).read_bytes())
+    options = {k: v for k, v in params.items() if k not in ("input_filepath", "output_filepath")}
+    h.update(json.dumps(options, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def convert_entry(params):
+    """Worker: convert one logo, returns its output path"""
+    convert_to_gds(**params)
+    return params["output_filepath"]
+
+
+def load_manifest(manifest):
+    """Conversion parameters of all logos in a manifest, paths relative to it"""
+    with open(manifest) as f:
+        config = yaml.safe_load(f)
+    base = Path(manifest).resolve().parent
+    defaults = config.get("defaults", {})
+
+    entries = []
+    for logo in config["logos"]:
+        params = dict(defaults)
+        params.update(logo)
+        params["input_filepath"] = str(base / params.pop("image"))
+        params["output_filepath"] = str(base / params.pop("gds"))
+        entries.append(params)
+    return entries
+
+
+def convert_all(entries, jobs=None, cache_file=DEFAULT_CACHE, force=False):
+    """Convert all entries in parallel, skipping those that are up to date"""
+    cache_file = Path(cache_file)
+    cache = json.loads(cache_file.read_text()) if cache_file.exists() else {}
+
+    todo = []
+    for params in entries:
+        output = str(Path(params["output_filepath"]).resolve())
+        key = cache_key(params)
+        if not force and cache.get(output) == key and Path(output).exists():
+            print(f"Up to date: {params['output_filepath']}")
+            continue
+        todo.append((output, key, params))
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        for (output, key, _), done in zip(todo, pool.map(convert_entry, [params for _, _, params in todo])):
+            print(f"Written: {done}")
+            cache[output] = key
+
+    cache_file.write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        prog="img2gds", description="Convert an image to GDS format"
+    )
+
+    parser.add_argument("image_path", nargs="?")
+    parser.add_argument("gds_path", nargs="?")
+    parser.add_argument(
+        "--manifest", type=Path, default=None, help="yaml file listing the logos to convert"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="number of parallel conversions"
+    )
+    parser.add_argument(
+        "--cache", type=Path, default=DEFAULT_CACHE, help="file storing the hashes of converted logos"
+    )
+    parser.add_argument("--force", action="store_true", help="ignore the cache")
+    parser.add_argument("--cellname", default="TOP", help="top cellname")
+    parser.add_argument(
+        "--pixel-size", type=float, default=0.3, help="pixel size in um"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="downscale the image, e.g. 0.5"
+    )
+    parser.add_argument(
+        "--width", type=int, default=None, help="scale to image width"
+    )
+    parser.add_argument(
+        "--height", type=int, default=None, help="scale to image height"
+    )
+    parser.add_argument(
+        "--threshold", type=int, default=128, help="threshold to compare against"
+    )
+    parser.add_argument("--invert", action="store_true", help="invert the pixels")
+    parser.add_argument(
+        "--invert-alpha", action="store_true", help="invert the alpha pixels"
+    )
+    parser.add_argument("--merge", action="store_true", help="merge polygons")
+    parser.add_argument(
+        "--foreground",
+        nargs="*",
+        type=str,
+        help="gds layer/datatype pair for foreground pixels e.g. 0/0",
+    )
+    parser.add_argument(
+        "--boundary",
+        nargs="*",
+        type=str,
+        help="gds layer/datatype pairs for boundary e.g. 0/0",
+    )
+    parser.add_argument("--smooth", action="store_true", help="smooth the edges")
+    parser.add_argument(
+        "--instances", action="store_true", help="place one pixel cell as arrays instead of flat boxes (without --merge)"
+    )
+
+    args = parser.parse_args()
+
+    if args.manifest:
+        entries = load_manifest(args.manifest)
+    elif args.image_path and args.gds_path:
+        entries = [dict(
+            input_filepath=args.image_path,
+            output_filepath=args.gds_path,
+            cellname=args.cellname,
+            scale=args.scale,
+            width=args.width,
+            height=args.height,
+            threshold=args.threshold,
+            invert=args.invert,
+            invert_alpha=args.invert_alpha,
+            merge=args.merge,
+            smooth=args.smooth,
+            instances=args.instances,
+            pixel_size=args.pixel_size,
+            foregrounds=args.foreground,
+            boundaries=args.boundary,
+        )]
+    else:
+        parser.error("either image_path and gds_path or --manifest is required")
+
+    convert_all(entries, jobs=args.jobs, cache_file=args.cache, force=args.force)
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Collects the LibreLane metrics of the macros and the chip into a SQLite
+# history keyed by git commit and config hash, and compares the variants.
+
+import os
+import re
+import csv
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MACROS_DIR = ROOT_DIR / "macros"
+DB_FILE = Path(os.getenv("METRICS_DB", ROOT_DIR / "metrics.db"))
+
+MACROS = ["frv_1", "frv_2", "frv_4", "frv_8", "frv_4ccx", "frv_1bram", "frv_8bram"]
+CHIP = "chip_top"
+
+# Rows of the comparison table, regular expressions on the metric names
+SUMMARY = [
+    r"design__die__bbox",
+    r"design__instance__area",
+    r"design__instance__utilization",
+    r"design__instance__count",
+    r"timing__setup__ws",
+    r"timing__setup__tns",
+    r"timing__hold__ws",
+    r"timing__setup__ws__corner:.*",
+    r"timing__setup__tns__corner:.*",
+    r"power__total",
+    r"route__drc_errors",
+    r"route__wirelength",
+    r"antenna__violating__nets",
+    r"magic__drc_error__count",
+    r"klayout__drc_error__count",
+    r"flow__runtime",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    design TEXT NOT NULL,
+    commit_id TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    metrics_hash TEXT NOT NULL,
+    run_tag TEXT,
+    collected REAL NOT NULL,
+    UNIQUE (design, commit_id, config_hash, metrics_hash)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    value REAL,
+    text TEXT,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    step TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, step)
+);
+"""
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty", "--abbrev=12"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def files_hash(files):
+    digest = hashlib.sha256()
+    for f in files:
+        digest.update(Path(f).name.encode())
+        digest.update(Path(f).read_bytes() if Path(f).exists() else b"missing")
+    return digest.hexdigest()[:16]
+
+
+def read_metrics(metrics_csv):
+    """Metric name -> value of a LibreLane metrics.csv"""
+    with open(metrics_csv, newline="") as f:
+        return {row[0]: row[1] for row in csv.reader(f) if len(row) >= 2 and row[0] != "Metric"}
+
+
+def parse_runtime(text):
+    """Seconds of a LibreLane runtime.txt (HH:MM:SS.mmm)"""
+    seconds = 0.0
+    for part in text.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def step_runtimes(run_dir):
+    steps = {}
+    if run_dir is None or not run_dir.is_dir():
+        return steps
+    for runtime in sorted(run_dir.glob("*/runtime.txt")):
+        try:
+            steps[runtime.parent.name] = parse_runtime(runtime.read_text())
+        except ValueError:
+            pass
+    return steps
+
+
+def origin_run(final, runs):
+    """Newest run whose final views are the ones copied to final/"""
+    metrics_csv = final / "metrics.csv"
+    if not metrics_csv.exists():
+        return None
+    content = metrics_csv.read_bytes()
+    for run in reversed(runs):
+        candidate = run / "final" / "metrics.csv"
+        if candidate.exists() and candidate.read_bytes() == content:
+            return run
+    return None
+
+
+def sources(all_runs):
+    """(design, final dir, run dir, config files) of everything to collect"""
+    chip_config = [ROOT_DIR / "librelane" / "config.yaml", *sorted((ROOT_DIR / "librelane" / "slots").glob("*.yaml"))]
+
+    found = []
+    for macro in MACROS:
+        macro_dir = MACROS_DIR / macro
+        config = [macro_dir / "config.yaml", macro_dir / "pin_order.cfg"]
+        runs = sorted((macro_dir / "runs").glob("*/"))
+        try:
+            run_dir = macro_dir / "runs" / json.loads((macro_dir / "final" / "inputs.json").read_text())["tag"]
+        except (OSError, ValueError, KeyError):
+            # Copied by make copy-macro
+            run_dir = origin_run(macro_dir / "final", runs)
+        found.append((macro, macro_dir / "final", run_dir, config))
+        if all_runs:
+            found += [(macro, run / "final", run, config) for run in runs]
+
+    # Copied by make copy-final
+    runs = sorted((ROOT_DIR / "librelane" / "runs").glob("*/"))
+    found.append((CHIP, ROOT_DIR / "final", origin_run(ROOT_DIR / "final", runs), chip_config))
+    found += [(CHIP, run / "final", run, chip_config) for run in (runs if all_runs else runs[-1:])]
+    return [entry for entry in found if (entry[1] / "metrics.csv").exists()]
+
+
+def collect(db, all_runs):
+    commit = git_commit()
+    added = 0
+    for design, final, run_dir, config in sources(all_runs):
+        metrics_csv = final / "metrics.csv"
+        metrics = read_metrics(metrics_csv)
+        steps = step_runtimes(run_dir)
+        if steps:
+            metrics["flow__runtime"] = f"{sum(steps.values()):.1f}"
+
+        key = (design, commit, files_hash(config), files_hash([metrics_csv]))
+        cursor = db.execute(
+            "INSERT OR IGNORE INTO runs (design, commit_id, config_hash, metrics_hash, run_tag, collected) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, run_dir.name if run_dir else None, time.time()),
+        )
+        if cursor.rowcount:
+            added += 1
+            run_id = cursor.lastrowid
+        else:
+            # Known, e.g. final/ and the run it was copied from: only add the step runtimes if missing
+            run_id = db.execute("SELECT id FROM runs WHERE design = ? AND commit_id = ? AND config_hash = ? "
+                                "AND metrics_hash = ?", key).fetchone()[0]
+            if not steps or db.execute("SELECT 1 FROM steps WHERE run_id = ?", (run_id,)).fetchone():
+                continue
+            db.execute("UPDATE runs SET run_tag = ? WHERE id = ? AND run_tag IS NULL", (run_dir.name, run_id))
+            metrics = {"flow__runtime": metrics["flow__runtime"]}
+        db.executemany("INSERT OR IGNORE INTO metrics VALUES (?, ?, ?, ?)",
+                       [(run_id, name, to_float(value), value) for name, value in metrics.items()])
+        db.executemany("INSERT INTO steps VALUES (?, ?, ?)",
+                       [(run_id, step, seconds) for step, seconds in steps.items()])
+    db.commit()
+    return added
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def history(db, design):
+    """Runs of a design, oldest first"""
+    return db.execute("SELECT id, commit_id, config_hash, run_tag FROM runs WHERE design = ? ORDER BY collected, id",
+                      (design,)).fetchall()
+
+
+def run_metrics(db, run_id):
+    return {name: (value, text) for name, value, text in
+            db.execute("SELECT name, value, text FROM metrics WHERE run_id = ?", (run_id,))}
+
+
+def selected(names, patterns):
+    return [name for pattern in patterns for name in sorted(names) if re.fullmatch(pattern, name)]
+
+
+def cell(current, previous):
+    value, text = current
+    if value is None or previous is None or previous[0] in (None, value):
+        return text
+    if previous[0]:
+        return f"{text} ({(value - previous[0]) / abs(previous[0]) * 100:+.1f}%)"
+    return f"{text} ({value - previous[0]:+g})"
+
+
+def print_table(header, rows):
+    widths = [max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))]
+    for row in [header, *rows]:
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)).rstrip())
+
+
+def compare(db, designs, patterns):
+    """Latest run of each design, with the change to the run before"""
+    latest = {}
+    for design in designs:
+        runs = history(db, design)
+        if runs:
+            previous = run_metrics(db, runs[-2][0]) if len(runs) > 1 else {}
+            latest[design] = (run_metrics(db, runs[-1][0]), previous, runs[-1][1])
+
+    if not latest:
+        print(f"No metrics in {DB_FILE}")
+        return
+
+    names = set().union(*(metrics for metrics, _, _ in latest.values()))
+    rows = [["commit", *(commit for _, _, commit in latest.values())]]
+    for name in selected(names, patterns):
+        rows.append([name, *(cell(metrics[name], previous.get(name)) if name in metrics else "-"
+                             for metrics, previous, _ in latest.values())])
+    print_table(["metric", *latest], rows)
+
+
+def trend(db, design, patterns):
+    """All runs of one design"""
+    runs = history(db, design)
+    if not runs:
+        print(f"No metrics for {design} in {DB_FILE}")
+        return
+    all_metrics = [run_metrics(db, run_id) for run_id, _, _, _ in runs]
+    names = selected(set().union(*all_metrics), patterns)
+    rows = []
+    previous = {}
+    for (_, commit, config, tag), metrics in zip(runs, all_metrics):
+        rows.append([commit, config, tag or "-",
+                     *(cell(metrics[n], previous.get(n)) if n in metrics else "-" for n in names)])
+        previous = metrics
+    print_table(["commit", "config", "run", *names], rows)
+
+
+def step_table(db, design):
+    """Step runtimes of the latest run of a design that has them"""
+    row = db.execute("SELECT r.id, r.run_tag FROM runs r WHERE r.design = ? AND EXISTS "
+                     "(SELECT 1 FROM steps s WHERE s.run_id = r.id) ORDER BY r.collected DESC, r.id DESC LIMIT 1",
+                     (design,)).fetchone()
+    if not row:
+        print(f"No step runtimes for {design} in {DB_FILE}")
+        return
+    entries = db.execute("SELECT step, seconds FROM steps WHERE run_id = ? ORDER BY seconds DESC", (row[0],)).fetchall()
+    total = sum(seconds for _, seconds in entries) or 1
+    print(f"{design} {row[1]}")
+    print_table(["step", "seconds", "share"],
+                [[step, f"{seconds:.1f}", f"{seconds / total * 100:.1f}%"] for step, seconds in entries])
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        prog="metrics_db", description="Collect and compare the macro and chip metrics"
+    )
+    parser.add_argument(
+        "--no-collect", action="store_true", help="only report, do not read new metrics"
+    )
+    parser.add_argument(
+        "--all-runs", action="store_true", help="collect every run in runs/, not only the final views"
+    )
+    parser.add_argument(
+        "--metrics", nargs="*", default=SUMMARY, help="regular expressions of the metrics to show"
+    )
+    parser.add_argument(
+        "--trend", metavar="DESIGN", help="show all recorded runs of one design"
+    )
+    parser.add_argument(
+        "--steps", metavar="DESIGN", help="show the step runtimes of the latest run of one design"
+    )
+
+    args = parser.parse_args()
+
+    db = sqlite3.connect(DB_FILE)
+    db.executescript(SCHEMA)
+
+    if not args.no_collect:
+        print(f"{collect(db, args.all_runs)} new runs in {DB_FILE}\n")
+
+    if args.trend:
+        trend(db, args.trend, args.metrics)
+    elif args.steps:
+        step_table(db, args.steps)
+    else:
+        compare(db, [*MACROS, CHIP], args.metrics)
+
+    db.close()
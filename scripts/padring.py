@@ -4,9 +4,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import re
 import sys
+import glob
+import json
 import yaml
 import shutil
+import hashlib
 import argparse
 
 from typing import List, Type, Tuple
@@ -33,6 +37,8 @@ from librelane.steps import (
 from librelane.steps.klayout import KLayoutStep
 from librelane.flows.flow import FlowError
 
+from flow_profile import run_profiled
+
 
 class PadringFlow(SequentialFlow):
 
@@ -60,7 +66,103 @@ class PadringFlow(SequentialFlow):
     ]
 
 
-def main(slot_config_path, config_path):
+# The front-end, reused if its inputs are unchanged
+FRONTEND = PadringFlow.Steps[: PadringFlow.Steps.index(Checker.NetlistAssignStatements) + 1]
+
+# Configuration that only affects the floorplan and pad ring
+FLOORPLAN_KEYS = re.compile(r"PAD_.*|DIE_AREA|CORE_AREA|FP_.*")
+
+# Files referenced by the configuration that affect the front-end
+FRONTEND_FILES = (".v", ".sv", ".vh", ".svh", ".vlt", ".lib", ".sdc")
+
+FRONTEND_STAMP = "frontend.json"
+
+
+def frontend_hash(flow_cfg, design_dir, pdk):
+    """Hash of the configuration and sources of lint and synthesis"""
+    cfg = {k: v for k, v in flow_cfg.items() if not FLOORPLAN_KEYS.fullmatch(k)}
+    digest = hashlib.sha256(pdk.encode())
+    digest.update(json.dumps(cfg, sort_keys=True).encode())
+
+    def files(value):
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, list):
+            return [f for v in value for f in files(v)]
+        if isinstance(value, str) and value.startswith("dir::") and value.endswith(FRONTEND_FILES):
+            return sorted(glob.glob(os.path.join(design_dir, value[len("dir::"):])))
+        return []
+
+    # Headers are found through the include directories
+    headers = []
+    for include_dir in cfg.get("VERILOG_INCLUDE_DIRS") or []:
+        if isinstance(include_dir, str):
+            include_dir = os.path.join(design_dir, include_dir[len("dir::"):]) if include_dir.startswith("dir::") else include_dir
+            headers += sorted(f for ext in ("*.vh", "*.svh") for f in glob.glob(os.path.join(include_dir, "**", ext), recursive=True))
+
+    for f in files(cfg) + headers:
+        digest.update(f.encode())
+        with open(f, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def step_dirs(run_dir):
+    """Directories of the steps run in a run, by step id slug"""
+    dirs = {}
+    for entry in sorted(os.listdir(run_dir)):
+        match = re.match(r"(\d+)-(.*)", entry)
+        if match and os.path.isdir(os.path.join(run_dir, entry)):
+            dirs[slug(match.group(2))] = (int(match.group(1)), os.path.join(run_dir, entry))
+    return dirs
+
+
+def resume_point(run_dir, step_id):
+    """
+    State of a run right before the given step, or before the earliest
+    step after the last one that completed. Returns (state, step id).
+    """
+    ids = [step.id for step in PadringFlow.Steps]
+    dirs = step_dirs(run_dir)
+    for index in reversed(range(ids.index(step_id))):
+        entry = dirs.get(slug(ids[index]))
+        state_out = entry and os.path.join(entry[1], "state_out.json")
+        if state_out and os.path.exists(state_out):
+            with open(state_out) as f:
+                return State.loads(f.read()), ids[index + 1]
+    return None, ids[0]
+
+
+def runs(design_dir, run_tag=None):
+    """Prior runs, newest first"""
+    runs_dir = os.path.join(design_dir, "runs")
+    if run_tag:
+        return [os.path.join(runs_dir, run_tag)]
+    if not os.path.isdir(runs_dir):
+        return []
+    return sorted((os.path.join(runs_dir, r) for r in os.listdir(runs_dir)), key=os.path.getmtime, reverse=True)
+
+
+def reusable_frontend(design_dir, digest):
+    """A prior run whose front-end had the same inputs"""
+    for run_dir in runs(design_dir):
+        try:
+            with open(os.path.join(run_dir, FRONTEND_STAMP)) as f:
+                if json.load(f)["hash"] != digest:
+                    continue
+        except (OSError, ValueError, KeyError):
+            continue
+        state, step_id = resume_point(run_dir, PadringFlow.Steps[len(FRONTEND)].id)
+        if step_id == PadringFlow.Steps[len(FRONTEND)].id:
+            return run_dir, state
+    return None, None
+
+
+def main(slot_config_path, config_path, frm=None, to=None, run_tag=None, reuse=True):
 
     PDK_ROOT = os.getenv("PDK_ROOT", os.path.expanduser("~/.ciel"))
     PDK = os.getenv("PDK", "gf180mcuD")
@@ -68,33 +170,81 @@ def main(slot_config_path, config_path):
     print(f"PDK_ROOT = {PDK_ROOT}")
     print(f"PDK = {PDK}")
 
-    flow_cfg = yaml.safe_load(open(slot_config_path))
-    flow_cfg.update(yaml.safe_load(open(config_path)))
+    with open(slot_config_path) as f:
+        flow_cfg = yaml.safe_load(f)
+    with open(config_path) as f:
+        flow_cfg.update(yaml.safe_load(f))
+
+    design_dir = os.path.dirname(config_path)
+    digest = frontend_hash(flow_cfg, design_dir, PDK)
+
+    # Initial state and first step
+    state = None
+    if frm == PadringFlow.Steps[0].id:
+        frm = None
+
+    if frm:
+        if run_tag and not os.path.isdir(os.path.join(design_dir, "runs", run_tag)):
+            print(f"Error: run {run_tag} not found in {os.path.join(design_dir, 'runs')}")
+            sys.exit(1)
+        # The newest run that reached the step, else the one that got closest
+        step_ids = [step.id for step in PadringFlow.Steps]
+        candidates = [(run_dir, *resume_point(run_dir, frm)) for run_dir in runs(design_dir, run_tag)]
+        candidates = [c for c in candidates if c[1] is not None]
+        if not candidates:
+            print(f"Error: no prior run with a state before {frm}")
+            sys.exit(1)
+        run_dir, state, start = max(candidates, key=lambda c: step_ids.index(c[2]))
+        if start != frm:
+            print(f"No run reached {frm}, {os.path.basename(run_dir)} stopped before it, starting from {start}")
+        frm = start
+        print(f"Starting from {frm} with the state of {os.path.basename(run_dir)}")
+    elif reuse:
+        run_dir, state = reusable_frontend(design_dir, digest)
+        if state:
+            frm = PadringFlow.Steps[len(FRONTEND)].id
+            print(f"Front-end unchanged, reusing {os.path.basename(run_dir)} and starting from {frm}")
+
+    # Only a run of the whole front-end is a source for later reuse
+    frontend_fresh = frm is None
 
     # Run flow
     flow = PadringFlow(
         flow_cfg,
-        design_dir=os.path.dirname(config_path),
+        design_dir=design_dir,
         pdk_root=PDK_ROOT,
         pdk=PDK,
     )
 
     try:
-        # Start the flow
-        flow.start()
+        # Start the flow, profiling each step
+        run_profiled(flow, "PadringFlow", with_initial_state=state, frm=frm, to=to)
     except FlowError as e:
         print(f"Error: \n{e}")
         sys.exit(1)
+    finally:
+        run_dir = getattr(flow, "run_dir", None)
+        if frontend_fresh and run_dir and os.path.isdir(run_dir):
+            with open(os.path.join(run_dir, FRONTEND_STAMP), "w") as f:
+                json.dump({"hash": digest}, f)
 
     print(f"Run successfully completed.")
 
 
 if __name__ == "__main__":
 
+    step_ids = [step.id for step in PadringFlow.Steps]
+
     parser = argparse.ArgumentParser()
     parser.add_argument("slot", default=".", help="path to slot config")
     parser.add_argument("config", default=".", help="path to config")
+    parser.add_argument("--from", dest="frm", choices=step_ids, metavar="STEP",
+                        help="start from this step with the state of a prior run")
+    parser.add_argument("--to", choices=step_ids, metavar="STEP", help="stop after this step")
+    parser.add_argument("--run-tag", help="prior run for --from (default: the newest that reached the step)")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="always run lint and synthesis, even if their inputs are unchanged")
 
     args = parser.parse_args()
 
-    main(args.slot, args.config)
+    main(args.slot, args.config, args.frm, args.to, args.run_tag, not args.no_reuse)
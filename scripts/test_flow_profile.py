@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: © 2025 Project Template Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+# Run with: python3 -m pytest scripts/test_flow_profile.py
+
+import json
+
+import flow_profile
+
+# As written by LibreLane's ProcessStatsThread.stats_as_dict: times through
+# format_elapsed_time, memory through format_size
+PROCESS_STATS = {
+    "time": {
+        "cpu_time_user": "00:01:10.250",
+        "cpu_time_system": "00:00:02.750",
+        "runtime": "00:01:15.500",
+        "cpu_time_iowait": "00:00:00.000",
+    },
+    "peak_resources": {
+        "cpu_percent": 99.8,
+        "memory_rss": "412MiB",
+        "memory_vms": "1GiB",
+        "threads": 4.0,
+    },
+    "avg_resources": {
+        "cpu_percent": 96.1,
+        "memory_rss": "301MiB",
+        "memory_vms": "1GiB",
+        "threads": 3.9,
+    },
+}
+
+
+def make_run(run_dir):
+    step = run_dir / "42-openroad-detailedrouting"
+    step.mkdir(parents=True)
+    (step / "runtime.txt").write_text("00:01:20.000")
+    (step / "state_out.json").write_text("{}")
+    (step / "openroad-detailedrouting.process_stats.json").write_text(json.dumps(PROCESS_STATS, indent=4))
+    return step
+
+
+def test_tool_stats(tmp_path):
+    step = make_run(tmp_path)
+    tool = flow_profile.tool_stats(step / "openroad-detailedrouting.process_stats.json")
+    assert tool == {"tool": "openroad-detailedrouting", "wall_s": 75.5, "cpu_s": 73.0, "peak_rss_mb": 412.0}
+
+
+def test_profile(tmp_path):
+    make_run(tmp_path)
+    flow_profile.profile(str(tmp_path), "Classic")
+
+    profile = json.loads((tmp_path / "profile.json").read_text())
+    step = profile["steps"][0]
+    assert (step["step"], step["status"], step["wall_s"], step["cpu_s"]) == ("openroad-detailedrouting", "ok", 80.0, 73.0)
+    assert profile["total"] == {"wall_s": 80.0, "cpu_s": 73.0, "peak_rss_mb": 412.0}
+
+    # Tool frame nested in its step, the rest of the step time on the step
+    folded = (tmp_path / "profile.folded").read_text().splitlines()
+    assert folded == ["Classic;openroad-detailedrouting;openroad-detailedrouting 75500",
+                      "Classic;openroad-detailedrouting 4500"]
+
+
+def test_parse():
+    assert flow_profile.parse_time("01:02:03.500") == 3723.5
+    assert flow_profile.parse_time(None) is None
+    assert flow_profile.parse_size("1GiB") == 2**30
+    assert flow_profile.parse_size("512B") == 512
+    assert flow_profile.parse_size("12 parsecs") is None
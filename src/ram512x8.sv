@@ -57,4 +57,22 @@ module ram512x8 (
 
 `endif
 
+`ifdef RAM_BACKDOOR
+  // Backdoor for the testbench: toggling backdoor_load reads backdoor_file,
+  // toggling backdoor_dump writes [backdoor_start, backdoor_end] to it
+  logic [1023:0] backdoor_file;
+  logic [31:0]   backdoor_start;
+  logic [31:0]   backdoor_end;
+  logic          backdoor_load = 0;
+  logic          backdoor_dump = 0;
+
+  `ifdef SIM
+  always @(backdoor_load) $readmemh(backdoor_file, mem_r);
+  always @(backdoor_dump) $writememh(backdoor_file, mem_r, backdoor_start, backdoor_end);
+  `else
+  always @(backdoor_load) $readmemh(backdoor_file, sram_0.mem);
+  always @(backdoor_dump) $writememh(backdoor_file, sram_0.mem, backdoor_start, backdoor_end);
+  `endif
+`endif
+
 endmodule
\ No newline at end of file
@@ -61,7 +61,12 @@ module wb_qspi_mem (
   output logic [3:0]  sd_oen_o
 );
   
+// Simulation builds can disable continuous read mode for comparison
+`ifdef WB_QSPI_MEM_NO_CRM
+localparam USE_CONTINUOUS_READ_MODE = 0;
+`else
 localparam USE_CONTINUOUS_READ_MODE = 1;
+`endif
 
 /*
 localparam INSTR_RAM_QRD = 32'b0000_1011_????_????_????_????_????_????; // (QSPI 8'h0B == 8'b0000_1011)